@@ -6,9 +6,13 @@ import streamlit as st
 from streamlit_oauth import OAuth2Component
 import os
 import sys
+import time
 from pathlib import Path
+import pandas as pd
 import requests
-from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
 from typing import Optional
 
 # Add project root to path
@@ -20,137 +24,136 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Import database modules for direct user storage
-from src.database.db import get_db_session
-from src.database import crud
 from src.config.constants import (
     DEFAULT_TOP_NEGATIVE_LIMIT,
     DEFAULT_USER_VIDEOS_LIMIT,
     DEFAULT_TOKEN_EXPIRY_SECONDS,
-    API_TIMEOUT_SECONDS,
+    TOKEN_REFRESH_MARGIN_SECONDS,
     REQUEST_TIMEOUT_SECONDS,
+    API_CACHE_TTL_SECONDS,
+    API_HEALTH_CACHE_TTL_SECONDS,
+    JOB_POLL_INTERVAL_SECONDS,
     GOOGLE_OAUTH_SCOPES,
     GOOGLE_OAUTH_AUTHORIZE_URL,
     GOOGLE_OAUTH_TOKEN_URL,
     GOOGLE_OAUTH_USERINFO_URL,
     GOOGLE_OAUTH_TOKENINFO_URL
 )
+from src.utils.url import extract_video_id
 
 # Configuration
 FASTAPI_URL = os.getenv("FASTAPI_URL", "http://localhost:8000")
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+REDIRECT_URI = os.getenv("STREAMLIT_REDIRECT_URI", "http://localhost:8501")
+
+@st.cache_resource
+def get_http() -> requests.Session:
+    """
+    Get the shared HTTP session (one per process) so FastAPI and Google calls
+    reuse keep-alive connections. Idempotent requests are retried on
+    gateway errors; POSTs are never retried.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+    return session
+
 
 # OAuth scopes
 SCOPES = ["openid"] + GOOGLE_OAUTH_SCOPES
+OAUTH_SCOPE = " ".join(SCOPES)  # space-separated string expected by authorize_button
+
+# Sentiment chart categories and bar colors (fixed for every render)
+SENTIMENT_LABELS = ["Positive", "Neutral", "Negative"]
+SENTIMENT_COLORS = ["#28a745", "#6c757d", "#dc3545"]
+
+# Sentiment count block shown above the chart
+SENTIMENT_METRIC_HTML = """
+<div style="font-size: 14px; font-weight: 600; ">
+    {label}
+</div>
+<div style="font-size: 35px; font-weight: 700; color:{color};">
+    {count}
+</div>
+<div style="font-size: 18px;">
+    {pct}
+</div>
+"""
+
+# OAuth component (credentials never change at runtime, so build it once per process)
+_oauth_component = None
+if GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET:
+    _oauth_component = OAuth2Component(
+        client_id=GOOGLE_CLIENT_ID,
+        client_secret=GOOGLE_CLIENT_SECRET,
+        authorize_endpoint=GOOGLE_OAUTH_AUTHORIZE_URL,
+        token_endpoint=GOOGLE_OAUTH_TOKEN_URL,
+        refresh_token_endpoint=GOOGLE_OAUTH_TOKEN_URL
+    )
 
 
 
 # SESSION STATE INITIALIZATION
 
+# Session keys and their starting values
+SESSION_DEFAULTS = {
+    "authenticated": False,
+    "user_info": None,
+    "user_id": None,
+    "access_token": None,
+    "token_expires_at": None,
+    "last_results": None,
+    "analyzing": False,
+    "analysis_job": None
+}
+
+
 def init_session_state():
-    """Initialize session state variables"""
-    if "authenticated" not in st.session_state:
-        st.session_state.authenticated = False
-    if "user_info" not in st.session_state:
-        st.session_state.user_info = None
-    if "user_id" not in st.session_state:
-        st.session_state.user_id = None
-    if "access_token" not in st.session_state:
-        st.session_state.access_token = None
-    if "token_expires_at" not in st.session_state:
-        st.session_state.token_expires_at = None
-    if "last_results" not in st.session_state:
-        st.session_state.last_results = None
-    if "analyzing" not in st.session_state:
-        st.session_state.analyzing = False
-        
-        
-def extract_video_id(url_or_id: str) -> str:
-    """
-    Extract YouTube video ID from URL or return as-is if already an ID
-    
-    Args:
-        url_or_id: YouTube URL or video ID
-        
-    Returns:
-        str: YouTube video ID
-    """
-    from urllib.parse import urlparse, parse_qs
-    
-    # If it's already an ID (11 chars), return it
-    if len(url_or_id) == 11 and url_or_id.replace('-', '').replace('_', '').isalnum():
-        return url_or_id
-    
-    # Handle youtu.be URLs
-    if 'youtu.be' in url_or_id:
-        parsed = urlparse(url_or_id)
-        return parsed.path.strip('/')
-    
-    # Handle youtube.com URLs
-    if 'youtube.com' in url_or_id:
-        parsed = urlparse(url_or_id)
-        query = parse_qs(parsed.query)
-        return query.get('v', [''])[0]
-    
-    # Return as-is if can't parse
-    return url_or_id
+    """Initialize session state variables (once per session)"""
+    if st.session_state.get("_init_done"):
+        return
+    for key, value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+    st.session_state["_init_done"] = True
+
 
-def get_video_title(video_id: str, access_token: str) -> str:
+@st.cache_data(ttl=API_CACHE_TTL_SECONDS, show_spinner=False)
+def get_video_titles_batch(video_ids: list, user_id: int) -> dict:
     """
-    Fetch video title from YouTube API
+    Get video titles from FastAPI, which batches and caches the YouTube lookups
     
     Args:
-        video_id: YouTube video ID
-        access_token: User's access token
+        video_ids: YouTube video IDs
+        user_id: ID of the logged in user
         
     Returns:
-        Video title or video ID if fetch fails
-    """
-    try:
-        response = requests.get(
-            f"https://www.googleapis.com/youtube/v3/videos",
-            params={
-                "part": "snippet",
-                "id": video_id,
-                "fields": "items(snippet(title))"
-            },
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=10
-        )
+        Dict of video ID to title (IDs YouTube doesn't return are left out)
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("items"):
-                return data["items"][0]["snippet"]["title"]
-    except Exception as e:
-        st.warning(f"Could not fetch video title: {e}")
-    
-    return video_id  # Fallback to ID if fetch fails
+    Raises:
+        requests.exceptions.RequestException: If the request fails (errors are not cached)
+    """
+    response = get_http().get(
+        f"{FASTAPI_URL}/api/videos/titles",
+        params={"user_id": user_id, "ids": ",".join(video_ids)},
+        timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 # OAUTH AUTHENTICATION
 
-@st.cache_resource
-def get_oauth_component():
-    """Get OAuth component (cached)"""
-    if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
-        st.error("⚠️ OAuth credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env")
-        st.stop()
-    
-    return OAuth2Component(
-        client_id=GOOGLE_CLIENT_ID,
-        client_secret=GOOGLE_CLIENT_SECRET,
-        authorize_endpoint=GOOGLE_OAUTH_AUTHORIZE_URL,
-        token_endpoint=GOOGLE_OAUTH_TOKEN_URL,
-        refresh_token_endpoint=GOOGLE_OAUTH_TOKEN_URL
-    )
-
-
 def get_google_user_info(access_token: str) -> Optional[dict]:
     """Get user information from Google"""
     try:
-        response = requests.get(
+        response = get_http().get(
             GOOGLE_OAUTH_USERINFO_URL,
             headers={"Authorization": f"Bearer {access_token}"},
             timeout=10
@@ -167,32 +170,78 @@ def save_user_to_database(user_info: dict, token: dict) -> Optional[int]:
     Save user and token to database
     Returns user_id if successful
     """
-    db = get_db_session()
     try:
-        # Calculate token expiry
-        expires_in = token.get("expires_in", 3600)
-        token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-        
-        # Create or update user
-        user = crud.create_or_update_user(
-            db,
-            google_id=user_info["id"],
-            email=user_info["email"],
-            name=user_info.get("name"),
-            access_token=token["access_token"],
-            refresh_token=token.get("refresh_token"),
-            token_expires_at=token_expires_at
-        )
+        # Imported on first login so the logged-out page doesn't load SQLAlchemy
+        from src.database.db import get_db_session
+        from src.database import crud
+        
+        # Pooled session, closed when the block exits; crud commits the user row
+        with get_db_session() as db:
+            # Calculate token expiry (epoch math, converted once for the DB column)
+            expires_in = token.get("expires_in", DEFAULT_TOKEN_EXPIRY_SECONDS)
+            token_expires_at = datetime.fromtimestamp(time.time() + expires_in, tz=timezone.utc)
+            
+            # Create or update user
+            user = crud.create_or_update_user(
+                db,
+                google_id=user_info["id"],
+                email=user_info["email"],
+                name=user_info.get("name"),
+                access_token=token["access_token"],
+                refresh_token=token.get("refresh_token"),
+                token_expires_at=token_expires_at
+            )
+            user_id = user.user_id
         
-        db.commit()
-        return user.user_id
+        return user_id
         
     except Exception as e:
-        db.rollback()
         st.error(f"Failed to save user to database: {e}")
         return None
-    finally:
-        db.close()
+
+
+def _token_valid() -> bool:
+    """Check if the session's access token has not expired yet"""
+    expires_at = st.session_state.get("token_expires_at")
+    return expires_at is not None and expires_at > time.time()
+
+
+def ensure_fresh_token():
+    """
+    Refresh the Google access token when it is about to expire
+    
+    The backend calls YouTube with the token stored in the database, so the
+    refreshed token is saved there too. Failures leave the session as is;
+    an expired token then falls back to the login screen.
+    """
+    expires_at = st.session_state.get("token_expires_at")
+    refresh_token = st.session_state.get("refresh_token")
+    if expires_at is None or not refresh_token or time.time() < expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+        return
+    
+    try:
+        response = get_http().post(
+            GOOGLE_OAUTH_TOKEN_URL,
+            data={
+                "client_id": GOOGLE_CLIENT_ID,
+                "client_secret": GOOGLE_CLIENT_SECRET,
+                "refresh_token": refresh_token,
+                "grant_type": "refresh_token"
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        token = response.json()
+    except requests.exceptions.RequestException:
+        return
+    
+    # Google doesn't resend the refresh token
+    token.setdefault("refresh_token", refresh_token)
+    
+    if save_user_to_database(st.session_state.user_info, token):
+        st.session_state.access_token = token["access_token"]
+        expires_in = token.get("expires_in", DEFAULT_TOKEN_EXPIRY_SECONDS)
+        st.session_state.token_expires_at = time.time() + expires_in  # epoch seconds
 
 
 def handle_authentication():
@@ -200,29 +249,29 @@ def handle_authentication():
     Handle OAuth authentication flow
     Returns True if authenticated, False otherwise
     """
-    # Check if already authenticated
-    if st.session_state.authenticated and st.session_state.user_id:
+    if st.session_state.get("authenticated"):
+        ensure_fresh_token()
+    
+    # Fast path: already authenticated with an unexpired token. Keep this ahead
+    # of the login UI so no login widgets are built for signed-in users
+    if st.session_state.get("authenticated") and st.session_state.get("user_id") and _token_valid():
         return True
     
-    oauth = get_oauth_component()
+    if _oauth_component is None:
+        st.error("⚠️ OAuth credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env")
+        st.stop()
     
     # Show login section
     st.markdown("### 🔐 Login Required")
     st.markdown("Please login with your Google account to analyze YouTube videos.")
     st.markdown("---")
     
-    # Get redirect URI from environment 
-    redirect_uri = os.getenv(
-        "STREAMLIT_REDIRECT_URI", 
-        "http://localhost:8501"  
-    )
-    
     # OAuth login button
-    result = oauth.authorize_button(
+    result = _oauth_component.authorize_button(
         name="Login with Google",
         icon="https://www.google.com/favicon.ico",
-        redirect_uri=redirect_uri,  # Use dynamic redirect URI
-        scope=" ".join(SCOPES),  # Convert list to space-separated string
+        redirect_uri=REDIRECT_URI,  # Use dynamic redirect URI
+        scope=OAUTH_SCOPE,
         key="google_oauth",
         extras_params={
             "access_type": "offline",
@@ -252,7 +301,7 @@ def handle_authentication():
                     st.session_state.refresh_token = token.get("refresh_token")
                     
                     expires_in = token.get("expires_in", DEFAULT_TOKEN_EXPIRY_SECONDS)
-                    st.session_state.token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+                    st.session_state.token_expires_at = time.time() + expires_in  # epoch seconds
                     
                     st.success(f"✅ Logged in as {user_info['email']}")
                     st.rerun()
@@ -263,138 +312,319 @@ def handle_authentication():
 
 def logout():
     """Logout user and clear session"""
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
+    st.session_state.clear()
     st.rerun()
 
 
 # API CALLS TO FASTAPI
 
+@st.cache_data(ttl=API_HEALTH_CACHE_TTL_SECONDS, show_spinner=False)
+def _probe_api_health() -> bool:
+    """
+    Probe the FastAPI health endpoint (healthy results cached briefly)
+    
+    Raises:
+        requests.RequestException: If the backend is down (failures are not cached)
+    """
+    response = get_http().get(f"{FASTAPI_URL}/health", timeout=2)
+    response.raise_for_status()
+    return True
+
+
 def check_api_health() -> bool:
-    """Check if FastAPI backend is running"""
+    """Check if FastAPI backend is running; re-probes right away after a failure"""
     try:
-        response = requests.get(f"{FASTAPI_URL}/health", timeout=2)
-        return response.status_code == 200
-    except:
+        return _probe_api_health()
+    except requests.RequestException:
         return False
 
 
-def analyze_video(video_url: str) -> dict:
+def start_analysis_job(video_url: str) -> str:
     """
-    Call FastAPI to analyze video
+    Ask FastAPI to analyze a video in the background
     
     Args:
         video_url: YouTube video URL or ID
         
     Returns:
-        Analysis results dictionary
+        Job ID to poll with get_analysis_job
+        
+    Raises:
+        Exception: If the job could not be started
     """
-    
     # Extract video ID from URL
     video_id = extract_video_id(video_url)
     
     try:
-        response = requests.post(
-            f"{FASTAPI_URL}/api/analyze",
+        response = get_http().post(
+            f"{FASTAPI_URL}/api/jobs",
             json={
                 "youtube_video_id": video_id,  # Use extracted ID
                 "user_id": st.session_state["user_id"]
             },
-            timeout=API_TIMEOUT_SECONDS
+            timeout=REQUEST_TIMEOUT_SECONDS
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            error_detail = response.json().get("detail", response.text)
-            raise Exception(f"Analysis failed: {error_detail}")
-            
-    except requests.exceptions.Timeout:
-        raise Exception("Analysis timed out. The video may have too many comments.")
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to connect to API: {e}")
     
-def get_top_negative_comments(youtube_video_id: str, limit: int = 5) -> list:
+    if response.status_code != 202:
+        # Only parse the body as JSON when the server says it is JSON
+        if response.headers.get("content-type", "").startswith("application/json"):
+            error_detail = response.json().get("detail", response.text)
+        else:
+            error_detail = response.text
+        raise Exception(f"Analysis failed: {error_detail}")
+    
+    return response.json()["job_id"]
+
+
+def get_analysis_job(job_id: str) -> dict:
     """
-    Get top negative comments from FastAPI
+    Get progress of an analysis job from FastAPI
+    
+    Returns:
+        Job status with done, pct, stage and either result or error
+        
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+    """
+    response = get_http().get(f"{FASTAPI_URL}/api/jobs/{job_id}", timeout=REQUEST_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=API_CACHE_TTL_SECONDS, show_spinner=False)
+def get_top_negative_comments(youtube_video_id: str, user_id: int, limit: int = DEFAULT_TOP_NEGATIVE_LIMIT) -> list:
+    """
+    Get top negative comments from FastAPI (cached per video, user and limit)
     
     Args:
         youtube_video_id: YouTube video ID (just the ID, not full URL)
+        user_id: ID of the logged in user
         limit: Number of comments to retrieve
         
     Returns:
         List of comment dictionaries with author, text, confidence
+        
+    Raises:
+        requests.exceptions.RequestException: If the request fails (errors are not cached)
+    """
+    response = get_http().get(
+        f"{FASTAPI_URL}/api/videos/{youtube_video_id}/comments/top-negative",
+        params={
+            "user_id": user_id,
+            "limit": limit
+        },
+        timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_top_negative_comments(youtube_video_id: str, limit: int = DEFAULT_TOP_NEGATIVE_LIMIT) -> list:
+    """
+    Get top negative comments for the logged in user, showing a warning on failure
+    
+    Args:
+        youtube_video_id: YouTube video ID
+        limit: Number of comments to retrieve
     """
     try:
-        response = requests.get(
-            f"{FASTAPI_URL}/api/videos/{youtube_video_id}/comments/top-negative",
-            params={
-                "user_id": st.session_state.user_id,
-                "limit": limit
-            },
-            timeout=REQUEST_TIMEOUT_SECONDS
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.warning(f"Could not fetch top negative comments: {response.status_code}")
-            return []
-            
+        return get_top_negative_comments(youtube_video_id, st.session_state.user_id, limit)
     except requests.exceptions.Timeout:
         st.warning("⏰ Request timed out while fetching comments")
-        return []
     except requests.exceptions.ConnectionError:
         st.warning("🔌 Cannot connect to FastAPI backend")
-        return []
+    except requests.exceptions.HTTPError as e:
+        st.warning(f"Could not fetch top negative comments: {e.response.status_code}")
     except Exception as e:
         st.warning(f"Error fetching comments: {e}")
-        return []
+    return []
+
+@st.cache_data(ttl=API_CACHE_TTL_SECONDS, show_spinner=False)
+def get_user_videos(user_id: int, limit: int = DEFAULT_USER_VIDEOS_LIMIT) -> list:
+    """Get user's video history from FastAPI (cached per user and limit)"""
+    response = get_http().get(
+        f"{FASTAPI_URL}/api/videos",
+        params={"user_id": user_id, "limit": limit},
+        timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    return response.json()
 
-def display_top_negative_comments(youtube_video_url: str):
-    """Display top negative comments"""
-    st.markdown("---")
-    st.subheader("💬 Top Negative Comments")
+
+# UI COMPONENTS
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_sentiment_bar_spec(
+    positive: int,
+    neutral: int,
+    negative: int,
+    pct_text: tuple
+) -> dict:
+    """Build the Vega-Lite spec for the sentiment bar chart (cached on the counts and percentage labels)"""
+    return {
+        "title": "Comment Sentiment Breakdown",
+        "height": 400,
+        "data": {
+            "values": [
+                {"sentiment": label, "count": count, "pct": pct}
+                for label, count, pct in zip(SENTIMENT_LABELS, (positive, neutral, negative), pct_text)
+            ]
+        },
+        "encoding": {
+            "x": {"field": "sentiment", "type": "nominal", "sort": SENTIMENT_LABELS,
+                  "title": "Sentiment", "axis": {"labelAngle": 0}},
+            "y": {"field": "count", "type": "quantitative", "title": "Number of Comments"}
+        },
+        "layer": [
+            {
+                "mark": "bar",
+                "encoding": {
+                    "color": {"field": "sentiment", "type": "nominal", "legend": None,
+                              "scale": {"domain": SENTIMENT_LABELS, "range": SENTIMENT_COLORS}}
+                }
+            },
+            {
+                "mark": {"type": "text", "dy": -8},
+                "encoding": {"text": {"field": "pct", "type": "nominal"}}
+            }
+        ]
+    }
+
+
+@st.fragment
+def display_analyze_input():
+    """URL input and Analyze button (fragment: editing the URL doesn't rerun the page)"""
+    # Initialize or update video URL from history page
+    if "video_url_input" not in st.session_state:
+        st.session_state.video_url_input = ""
+    
+    if st.session_state.get("selected_video"):
+        st.session_state.video_url_input = st.session_state.selected_video
+        del st.session_state.selected_video
+    
+    # Video URL input
+    video_url = st.text_input(
+        "YouTube Video URL",
+        value=st.session_state.video_url_input,
+        placeholder="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        help="Paste the full URL or just the video ID",
+        label_visibility="collapsed"
+    )
     
-    # Extract video ID from URL
-    video_id = extract_video_id(youtube_video_url)
+    # Always update session state
+    if video_url != st.session_state.video_url_input:
+        st.session_state.video_url_input = video_url
     
-    with st.spinner("Loading top negative comments..."):
-        comments = get_top_negative_comments(video_id, limit=DEFAULT_TOP_NEGATIVE_LIMIT)
+    # Analyze button
+    analyze_button = st.button(
+        "🔍 Analyze Comments",
+        type="primary",
+        disabled=st.session_state.analyzing,
+        use_container_width=True
+    )
     
-    if not comments:
-        st.info("No negative comments found or analysis not complete yet.")
+    # Handle analysis
+    if analyze_button:
+        if not video_url or not video_url.strip():
+            st.error("⚠️ Please enter a YouTube URL")
+        else:
+            try:
+                job_id = start_analysis_job(video_url)
+            except Exception as e:
+                st.error(f"❌ {e}")
+            else:
+                st.session_state.analysis_job = {
+                    "job_id": job_id,
+                    "video_url": video_url
+                }
+                st.session_state.analyzing = True
+                st.rerun(scope="app")
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL_SECONDS)
+def display_analysis_progress():
+    """Poll the running analysis job and show its progress (fragment: only this reruns)"""
+    job = st.session_state.get("analysis_job")
+    if not job:
         return
     
-    for i, comment in enumerate(comments, 1):
-        with st.expander(f" (Confidence: {comment['confidence']:.1%})"):
-            st.write(comment['text'])
-
-
-def get_user_videos(limit: int = DEFAULT_USER_VIDEOS_LIMIT) -> list:
-    """Get user's video history from FastAPI"""
     try:
-        response = requests.get(
-            f"{FASTAPI_URL}/api/videos",
-            params={"user_id": st.session_state.user_id, "limit": limit},
-            timeout=REQUEST_TIMEOUT_SECONDS
+        status = get_analysis_job(job["job_id"])
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and 400 <= e.response.status_code < 500:
+            # The job is gone (backend restarted or pruned it); polling again won't bring it back
+            st.session_state.pop("analysis_job", None)
+            st.session_state.analyzing = False
+            st.session_state.analysis_error = "Analysis job was lost, please retry"
+            st.rerun(scope="app")
+        st.warning(f"Could not check analysis progress: {e}")
+        return
+    except requests.exceptions.RequestException as e:
+        # Keep polling; the backend may just be busy
+        st.warning(f"Could not check analysis progress: {e}")
+        return
+    
+    if not status["done"]:
+        st.progress(status["pct"], text=f"🎬 {status['stage']}...")
+        return
+    
+    st.session_state.analysis_job = None
+    st.session_state.analyzing = False
+    results = status.get("result")
+    
+    if results and results.get("success"):
+        video_id = extract_video_id(job["video_url"])
+        fp = (
+            results.get("analysis_id"),
+            results["total_comments"],
+            results["positive_count"],
+            results["neutral_count"],
+            results["negative_count"],
+            job["video_url"]
         )
-        if response.status_code == 200:
-            return response.json()
-        return []
-    except Exception:
-        return []
-
-
-# UI COMPONENTS
-
+        # Re-analyzing the same video within the backend cache window returns the
+        # same analysis; the cached history and comments are still current then
+        if st.session_state.get("_results_fp") != fp:
+            st.session_state._results_fp = fp
+            # New analysis invalidates this user's cached history and comments for the video
+            get_user_videos.clear(st.session_state.user_id, DEFAULT_USER_VIDEOS_LIMIT)
+            get_top_negative_comments.clear(video_id, st.session_state.user_id, DEFAULT_TOP_NEGATIVE_LIMIT)
+            # Fetch the top negatives now so the rerun renders them from cache
+            try:
+                get_top_negative_comments(video_id, st.session_state.user_id, DEFAULT_TOP_NEGATIVE_LIMIT)
+            except Exception:
+                pass
+        st.session_state.last_results = results
+        st.session_state.last_video_id = job["video_url"]
+        try:
+            titles = get_video_titles_batch([video_id], st.session_state.user_id)
+        except Exception:
+            titles = {}
+        st.session_state.last_video_title = titles.get(video_id)
+    elif results:
+        st.session_state.analysis_error = results.get("message", "Analysis failed")
+    else:
+        st.session_state.analysis_error = f"Analysis failed: {status['error']}"
+    
+    # Re-enable the analyze button and show the outcome
+    st.rerun(scope="app")
+
+
+@st.fragment
 def display_analysis_results(results: dict):
-    """Display analysis results with visualizations"""
+    """Display analysis results with visualizations (fragment: reruns on its own)"""
     # Handle None or empty results
     if not results:
         st.warning("⚠️ No analysis results available")
         return
     
+    # Clearing lives inside the fragment so the click doesn't rerun the page first
+    if st.button("🔄 Clear Results"):
+        st.session_state.last_results = None
+        st.rerun(scope="app")
+    
     if not results.get("success"):
         st.warning(results.get("message", "Analysis failed"))
         return
@@ -412,94 +642,38 @@ def display_analysis_results(results: dict):
             results["total_comments"]
         )
     
-    with col2:
-        st.markdown(
-            f"""
-            <div style="font-size: 14px; font-weight: 600; ">
-                Positive
-            </div>
-            <div style="font-size: 35px; font-weight: 700; color:#28a745;">
-                {results["positive_count"]}
-            </div>
-            <div style="font-size: 18px;">
-                {results['positive_percentage']:.1f}%
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-    
-    with col3:
-        st.markdown(
-            f"""
-            <div style="font-size: 14px; font-weight: 600; ">
-                Neutral
-            </div>
-            <div style="font-size: 35px; font-weight: 700; color:#999999;">
-                {results["neutral_count"]}
-            </div>
-            <div style="font-size: 18px;">
-                {results['neutral_percentage']:.1f}%
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col4:
-        st.markdown(
-            f"""
-            <div style="font-size: 14px; font-weight: 600; ">
-                Negative
-            </div>
-            <div style="font-size: 35px; font-weight: 700; color:#DC143C;">
-                {results["negative_count"]}
-            </div>
-            <div style="font-size: 18px;">
-                {results['negative_percentage']:.1f}%
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    # Percentages come from the counts, formatted once for the metrics and the chart
+    total = results["total_comments"] or 1
+    counts = [results["positive_count"], results["neutral_count"], results["negative_count"]]
+    pct_text = tuple(f"{count * 100 / total:.1f}%" for count in counts)
+    
+    for col, label, color, count, pct in zip(
+        (col2, col3, col4), SENTIMENT_LABELS, SENTIMENT_COLORS, counts, pct_text
+    ):
+        with col:
+            st.markdown(
+                SENTIMENT_METRIC_HTML.format(label=label, color=color, count=count, pct=pct),
+                unsafe_allow_html=True
+            )
     
     # Bar chart
     st.markdown("---")
     st.subheader("Sentiment Distribution")
     
-    import plotly.graph_objects as go
-    
-    fig = go.Figure(data=[
-        go.Bar(
-            x=["Positive", "Neutral", "Negative"],
-            y=[results["positive_count"], results["neutral_count"], results["negative_count"]],
-            marker_color=["#28a745", "#6c757d", "#dc3545"],
-            text=[
-                f"{results['positive_percentage']:.1f}%",
-                f"{results['neutral_percentage']:.1f}%",
-                f"{results['negative_percentage']:.1f}%"
-            ],
-            textposition="auto"
-        )
-    ])
-    
-    fig.update_layout(
-        title="Comment Sentiment Breakdown",
-        xaxis_title="Sentiment",
-        yaxis_title="Number of Comments",
-        showlegend=False,
-        height=400
-    )
+    spec = _build_sentiment_bar_spec(*counts, pct_text)
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.vega_lite_chart(spec, use_container_width=True)
 
 
+@st.fragment
 def display_top_negative_comments(youtube_video_url: str):
-    """Display top negative comments"""
+    """Display top negative comments (fragment: reruns on its own)"""
     st.subheader("💬 Top Negative Comments")
     
     # Extract just the video ID from the URL
     video_id = extract_video_id(youtube_video_url)
     
-    comments = get_top_negative_comments(video_id, limit=5)
+    comments = fetch_top_negative_comments(video_id, limit=DEFAULT_TOP_NEGATIVE_LIMIT)
     
     if not comments:
         st.info("No negative comments found or analysis not complete yet.")
@@ -510,12 +684,28 @@ def display_top_negative_comments(youtube_video_url: str):
             st.write(comment['text'])
 
 
+def _open_history_video(videos: list):
+    """Selection callback for the history table: open the picked video on the Analyze page"""
+    rows = st.session_state.history_table.selection.rows
+    if not rows:
+        return
+    full_url = f"https://www.youtube.com/watch?v={videos[rows[0]]['youtube_video_id']}"
+    st.session_state.selected_video = full_url
+    st.session_state.video_url_input = full_url
+    st.session_state.page_navigation = "🔍 Analyze Video"
+    # Drop the selection so the table doesn't reopen the video when History is shown again
+    del st.session_state.history_table
+
+
 def display_video_history():
     """Display user's video analysis history"""
     st.subheader("Analysis History")
     
     with st.spinner("Loading your videos..."):
-        videos = get_user_videos(limit=DEFAULT_USER_VIDEOS_LIMIT)
+        try:
+            videos = get_user_videos(st.session_state.user_id, limit=DEFAULT_USER_VIDEOS_LIMIT)
+        except Exception:
+            videos = []
     
     if not videos:
         st.info("No videos analyzed yet. Start by analyzing your first video!")
@@ -524,37 +714,60 @@ def display_video_history():
     st.markdown(f"**{len(videos)} video(s) analyzed**")
     st.markdown("---")
     
-    for video in videos:
-        # Use title if available, fallback to ID
-        display_title = video.get('title') or f"Video {video['youtube_video_id']}"
-        
-        # Create card layout
-        st.markdown(f"""
-        <div class="video-card">
-            <div class="video-title">{display_title}</div>
-            <div class="video-meta">
-                Analyzed: {video['created_at'][:10]} | 
-                Analyses: {video['analysis_count']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([5, 1])
-        
-        with col2:
-            if st.button("View Analysis", key=f"view_{video['video_id']}", use_container_width=True):
-                full_url = f"https://www.youtube.com/watch?v={video['youtube_video_id']}"
-                st.session_state.selected_video = full_url
-                st.session_state.switch_to_analyze = True
-                st.session_state.video_url_input = full_url
-                st.rerun()
-        
-        st.markdown("<br>", unsafe_allow_html=True)
+    # One table instead of a card and button per video
+    df = pd.DataFrame(videos)[["title", "youtube_video_id", "created_at", "analysis_count"]]
+    # Look up titles the backend couldn't store, in one batched call
+    missing = [v["youtube_video_id"] for v in videos if not v.get("title")]
+    titles = {}
+    if missing:
+        try:
+            titles = get_video_titles_batch(missing, st.session_state.user_id)
+        except Exception:
+            pass
+    # Use title if available, fallback to ID
+    df["title"] = [
+        v.get("title") or titles.get(v["youtube_video_id"]) or f"Video {v['youtube_video_id']}"
+        for v in videos
+    ]
+    df["created_at"] = pd.to_datetime(df["created_at"], format="ISO8601").dt.date
+    
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        on_select=lambda: _open_history_video(videos),
+        selection_mode="single-row",
+        key="history_table",
+        column_config={
+            "title": "Title",
+            "youtube_video_id": "Video ID",
+            "created_at": "Analyzed",
+            "analysis_count": "Analyses"
+        }
+    )
+    st.caption("Select a row to view its analysis")
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
+# Page stylesheet, built once at import
+CUSTOM_CSS = """
+<style>
+.stButton>button {
+    width: 100%;
+}
+.success-box {
+    padding: 1rem;
+    border-radius: 0.5rem;
+    background-color: #d4edda;
+    border: 1px solid #c3e6cb;
+    color: #155724;
+}
+</style>
+"""
+
+
 def main():
     """Main Streamlit application"""
     st.set_page_config(
@@ -567,21 +780,8 @@ def main():
     # Initialize session state
     init_session_state()
     
-    # Custom CSS
-    st.markdown("""
-    <style>
-    .stButton>button {
-        width: 100%;
-    }
-    .success-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Custom CSS (must be emitted every run, Streamlit drops elements that are not re-rendered)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     
     # Header
     st.title("YouTube Sentiment Analyzer")
@@ -592,26 +792,27 @@ def main():
     if not handle_authentication():
         st.info("👆 Click the button above to get started!")
         
-        # Show features while logged out
-        st.markdown("---")
-        st.markdown("###  Features")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(" **AI-Powered**")
-            st.caption("Uses BERT transformer model for sentiment analysis")
-        with col2:
-            st.markdown(" **Visual Analytics**")
-            st.caption("Interactive charts and sentiment breakdowns")
-        with col3:
-            st.markdown(" **Top Comments**")
-            st.caption("Identifies top comments automatically")
+        # Show features while logged out (one markdown element per block of text)
+        st.markdown("---\n###  Features")
+        features = [
+            ("AI-Powered", "Uses BERT transformer model for sentiment analysis"),
+            ("Visual Analytics", "Interactive charts and sentiment breakdowns"),
+            ("Top Comments", "Identifies top comments automatically")
+        ]
+        for col, (name, blurb) in zip(st.columns(3), features):
+            col.markdown(
+                f"**{name}**  \n<small style='color: #777;'>{blurb}</small>",
+                unsafe_allow_html=True
+            )
         
-        st.markdown("---")
-        st.markdown("### How It Works")
-        st.markdown("1. Login with your Google account")
-        st.markdown("2. Paste a YouTube video URL")
-        st.markdown("3. Get sentiment analysis results")
-        st.markdown("4. View detailed charts and top comments")
+        st.markdown(
+            "---\n"
+            "### How It Works\n"
+            "1. Login with your Google account\n"
+            "2. Paste a YouTube video URL\n"
+            "3. Get sentiment analysis results\n"
+            "4. View detailed charts and top comments"
+        )
         
         st.stop()
     
@@ -632,24 +833,14 @@ def main():
             with col2:
                 st.image(st.session_state.user_info['picture'], width=80)
         
-        # Navigation - handle switch from history page
-        if st.session_state.get("switch_to_analyze"):
-            default_index = 0  # Analyze Video page
-        else:
-            default_index = 0
-        
+        # Navigation (the history table switches pages by setting page_navigation)
         page = st.radio(
             "Navigation",
             ["🔍 Analyze Video", "📹 History"],
-            index=default_index,
             label_visibility="collapsed",
             key="page_navigation"
         )
         
-        # Clear the switch flag after page is set
-        if st.session_state.get("switch_to_analyze"):
-            st.session_state.switch_to_analyze = False
-        
         st.markdown("---")
         
         # Logout button
@@ -661,70 +852,19 @@ def main():
         st.markdown("### Analyze YouTube Video Comments")
         st.markdown("Enter a YouTube video URL to analyze the sentiment of its comments.")
         
-        # Initialize or update video URL from history page
-        if "video_url_input" not in st.session_state:
-            st.session_state.video_url_input = ""
+        display_analyze_input()
         
-        if st.session_state.get("selected_video"):
-            st.session_state.video_url_input = st.session_state.selected_video
-            del st.session_state.selected_video
-        
-        # Video URL input
-        video_url = st.text_input(
-            "YouTube Video URL",
-            value=st.session_state.video_url_input,
-            placeholder="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            help="Paste the full URL or just the video ID",
-            label_visibility="collapsed"
-        )
+        if st.session_state.get("analysis_job"):
+            display_analysis_progress()
         
-        # Always update session state
-        if video_url != st.session_state.video_url_input:
-            st.session_state.video_url_input = video_url
-
-        # Analyze button
-        col1, col2, col3 = st.columns([2, 1, 1])
-        
-        with col1:
-            analyze_button = st.button(
-                "🔍 Analyze Comments",
-                type="primary",
-                disabled=st.session_state.analyzing,
-                use_container_width=True
-            )
-        
-        with col2:
-            if st.session_state.last_results:
-                if st.button("🔄 Clear Results", use_container_width=True):
-                    st.session_state.last_results = None
-                    st.rerun()
-        
-        # Handle analysis
-        if analyze_button:
-            if not video_url or not video_url.strip():
-                st.error("⚠️ Please enter a YouTube URL")
-            else:
-                # Debug: show what URL is being analyzed
-                st.info(f"Analyzing: {video_url}")
-                
-                with st.spinner("🎬 Fetching comments and analyzing sentiment... "):
-                    results = analyze_video(video_url)
-                    
-                    # Only store results if they exist and are successful
-                    if results and results.get("success"):
-                        st.session_state.last_results = results
-                        st.session_state.last_video_id = video_url
-                        st.rerun()
-                    elif results:
-                        # Show error message but don't store None
-                        st.error(results.get("message", "Analysis failed"))
-                    else:
-                        # analyze_video already showed error message
-                        pass
+        if st.session_state.get("analysis_error"):
+            st.error(st.session_state.pop("analysis_error"))
         
         # Display results
         if st.session_state.get("last_results"):
             st.markdown("---")
+            if st.session_state.get("last_video_title"):
+                st.markdown(f"#### 📺 {st.session_state.last_video_title}")
             display_analysis_results(st.session_state["last_results"])
             
             if st.session_state.get("last_video_id"):
@@ -3,30 +3,43 @@ FastAPI Backend for YouTube Sentiment Analyzer (Hybrid Architecture)
 - Streamlit handles: UI + OAuth (streamlit-oauth)
 - FastAPI handles: Video analysis + Database operations
 """
+import heapq
 import os
+import queue
 import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from operator import itemgetter
 from pathlib import Path
 
 # Add project root to path for imports
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Callable, Dict, Iterable, Iterator, Optional, List
 from dotenv import load_dotenv
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+import requests
 
 # Load environment variables
 load_dotenv()
 
 # Import your modules
-from src.database.db import get_session
+from src.database.db import get_session, get_db_session, engine
 from src.database import crud
 from src.backend.analyzers.bert_sentiment_analyzer import BertSentimentAnalyzer
 from src.backend.api.youtube_comment_fetcher import YoutubeCommentFetcher
 from src.utils.logger import get_logger
+from src.utils.url import extract_video_id
 from src.utils.exceptions import (
     APIQuotaExceededError,
     VideoNotFoundError,
@@ -34,23 +47,57 @@ from src.utils.exceptions import (
     APIConnectionError
 )
 from src.config.constants import (
+    ANALYSIS_PROGRESS_CHUNK,
+    DB_HEALTH_CACHE_TTL_SECONDS,
+    COMMENT_PAGE_PREFETCH,
     DEFAULT_CACHE_HOURS,
     DEFAULT_TOP_NEGATIVE_LIMIT,
     DEFAULT_VIDEO_LIMIT,
     DEFAULT_FRONTEND_ORIGINS,
-    YOUTUBE_API_VIDEO_ENDPOINT
+    DEFAULT_SENTIMENT_MODEL,
+    DEFAULT_BERT_DTYPE,
+    JOB_RETENTION_SECONDS,
+    TITLE_CACHE_MAX_ENTRIES,
+    TITLE_CACHE_TTL_SECONDS,
+    YOUTUBE_API_VIDEO_ENDPOINT,
+    YOUTUBE_VIDEOS_MAX_IDS
 )
 
 # Initialize logger
 logger = get_logger()
 
+# STARTUP/SHUTDOWN
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm the BERT model once at startup so the first analysis doesn't pay for it"""
+    logger.info(" FastAPI application starting...")
+    logger.info(f" API docs available at /docs")
+    logger.info(f" Allowed CORS origins: {', '.join(FRONTEND_ORIGINS)}")
+    
+    # Pre-load BERT model and run one inference so one-time kernel/allocator setup happens now
+    try:
+        get_bert_analyzer().analyze_comments_batch(["warmup"])
+        logger.info("✅ BERT model pre-loaded successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to pre-load BERT model: {e}")
+        logger.warning("⚠️ Model will load on first analysis request")
+    
+    yield
+    
+    logger.info(" FastAPI application shutting down...")
+    shutdown_title_executor()
+    _youtube_http.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="YouTube Sentiment Analyzer API",
     description="Hybrid Architecture: Analysis backend for Streamlit frontend",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS for Streamlit
@@ -65,6 +112,8 @@ app.add_middleware(
 )
 
 # Initialize BERT analyzer (singleton pattern)
+SENTIMENT_MODEL_NAME = os.getenv("SENTIMENT_MODEL_NAME", DEFAULT_SENTIMENT_MODEL)
+BERT_DTYPE = os.getenv("BERT_DTYPE", DEFAULT_BERT_DTYPE).lower()
 _bert_analyzer = None
 
 def get_bert_analyzer() -> BertSentimentAnalyzer:
@@ -72,7 +121,7 @@ def get_bert_analyzer() -> BertSentimentAnalyzer:
     global _bert_analyzer
     if _bert_analyzer is None:
         logger.info("Initializing BERT sentiment analyzer...")
-        _bert_analyzer = BertSentimentAnalyzer()
+        _bert_analyzer = BertSentimentAnalyzer(SENTIMENT_MODEL_NAME, BERT_DTYPE)
         logger.info("✅ BERT analyzer ready")
     return _bert_analyzer
 
@@ -131,27 +180,23 @@ class ErrorResponse(BaseModel):
     status_code: int
 
 
-# HELPER FUNCTIONS
+class AnalyzeJobResponse(BaseModel):
+    """Response model for a started analysis job"""
+    job_id: str
+
+
+class AnalyzeJobStatus(BaseModel):
+    """Progress and outcome of an analysis job"""
+    job_id: str
+    done: bool
+    pct: int
+    stage: str
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
 
-def extract_video_id(youtube_url_or_id: str) -> str:
-    """
-    Extract video ID from YouTube URL or return ID if already extracted
-    
-    Supports:
-    - https://www.youtube.com/watch?v=VIDEO_ID
-    - https://youtu.be/VIDEO_ID
-    - VIDEO_ID (direct)
-    """
-    if "youtube.com/watch?v=" in youtube_url_or_id:
-        from urllib.parse import urlparse, parse_qs
-        parsed = urlparse(youtube_url_or_id)
-        return parse_qs(parsed.query)['v'][0]
-    elif "youtu.be/" in youtube_url_or_id:
-        return youtube_url_or_id.split("youtu.be/")[1].split("?")[0]
-    else:
-        # Assume it's already a video ID
-        return youtube_url_or_id
 
+# HELPER FUNCTIONS
 
 def get_current_user(user_id: int, db: Session) -> crud.User:
     """
@@ -170,6 +215,131 @@ def get_current_user(user_id: int, db: Session) -> crud.User:
     return user
 
 
+def iter_in_background(items: Iterable, maxsize: int) -> Iterator:
+    """
+    Iterate over items produced by a background thread, buffering up to maxsize ahead
+    
+    Exceptions raised while producing are re-raised to the consumer, and the producer
+    stops at its next item once the consumer is done or fails.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    end = object()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((end, e))
+            return
+        put((end, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+# Video ID -> (title, fetched_at); titles are shared by every user for TITLE_CACHE_TTL_SECONDS,
+# and the oldest entries are evicted past TITLE_CACHE_MAX_ENTRIES. A None title marks an ID
+# YouTube didn't return (deleted or private), so it isn't looked up again until it expires
+_title_cache: dict = {}
+_title_cache_lock = threading.Lock()
+
+# Keep-alive connection pool for YouTube Data API calls, so repeat lookups skip the TCP/TLS handshake
+_youtube_http = requests.Session()
+
+# Runs title lookups so they overlap with the comment fetch of an analysis; created on first
+# use and shut down with the app, so a later lifespan in the same process gets a fresh pool
+_title_executor = None
+_title_executor_lock = threading.Lock()
+
+
+def get_title_executor() -> ThreadPoolExecutor:
+    """Get or create the title lookup thread pool (singleton)"""
+    global _title_executor
+    with _title_executor_lock:
+        if _title_executor is None:
+            _title_executor = ThreadPoolExecutor(max_workers=4)
+        return _title_executor
+
+
+def shutdown_title_executor() -> None:
+    """Shut down the title lookup pool, if one was started, without waiting on running lookups"""
+    global _title_executor
+    with _title_executor_lock:
+        executor, _title_executor = _title_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_video_titles(video_ids: List[str], access_token: str) -> Dict[str, str]:
+    """
+    Get video titles from the cache, fetching the rest in videos.list batches of 50
+    
+    Returns:
+        Dict of video ID to title (IDs YouTube doesn't return are left out)
+    
+    Raises:
+        requests.RequestException: If a YouTube request fails
+    """
+    now = time.time()
+    titles = {}
+    known = set()
+    
+    with _title_cache_lock:
+        for vid in video_ids:
+            cached = _title_cache.get(vid)
+            if cached and now - cached[1] < TITLE_CACHE_TTL_SECONDS:
+                known.add(vid)
+                if cached[0] is not None:
+                    titles[vid] = cached[0]
+    
+    missing = [vid for vid in dict.fromkeys(video_ids) if vid not in known]
+    for start in range(0, len(missing), YOUTUBE_VIDEOS_MAX_IDS):
+        batch = missing[start:start + YOUTUBE_VIDEOS_MAX_IDS]
+        response = _youtube_http.get(
+            YOUTUBE_API_VIDEO_ENDPOINT,
+            params={
+                "part": "snippet",
+                "id": ",".join(batch),
+                "fields": "items(id,snippet(title))"
+            },
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=5
+        )
+        response.raise_for_status()
+        fetched = {item["id"]: item["snippet"]["title"] for item in response.json().get("items", [])}
+        
+        with _title_cache_lock:
+            for vid in batch:
+                _title_cache.pop(vid, None)  # re-insert so the dict stays ordered oldest fetch first
+                _title_cache[vid] = (fetched.get(vid), now)
+            while len(_title_cache) > TITLE_CACHE_MAX_ENTRIES:
+                del _title_cache[next(iter(_title_cache))]
+        titles.update(fetched)
+    
+    return titles
+
+
 # ROOT ENDPOINTS
 
 @app.get("/")
@@ -184,27 +354,46 @@ def root():
     }
 
 
-@app.get("/health")
-def health_check():
-    #Health check endpoint - checks database connectivity
-    from src.database.db import engine
+# (checked_at, error) of the last database ping, reused for DB_HEALTH_CACHE_TTL_SECONDS
+_db_health: tuple = (float("-inf"), None)
+
+
+def ping_database() -> Optional[str]:
+    """Ping the database through the pool at most once per DB_HEALTH_CACHE_TTL_SECONDS, returning the error if any"""
+    global _db_health
+    checked_at, error = _db_health
+    now = time.monotonic()
+    if now - checked_at < DB_HEALTH_CACHE_TTL_SECONDS:
+        return error
     
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        
+            conn.execute(text("SELECT 1"))
+        error = None
+    except Exception as e:
+        logger.error(f"Health check failed: {e}")
+        error = str(e)
+    
+    _db_health = (now, error)
+    return error
+
+
+@app.get("/health")
+def health_check():
+    #Health check endpoint - checks database connectivity
+    error = ping_database()
+    if error is None:
         return {
             "status": "healthy",
             "database": "connected",
             "bert_model": "loaded" if _bert_analyzer else "not_loaded"
         }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e)
-        }
+    
+    return {
+        "status": "unhealthy",
+        "database": "disconnected",
+        "error": error
+    }
 
 
 # VIDEO ANALYSIS ENDPOINT
@@ -214,6 +403,24 @@ def analyze_video(
     request: AnalyzeRequest,
     db: Session = Depends(get_session)
 ):
+    """
+    Analyze YouTube video comments with BERT sentiment analysis (blocks until done)
+    
+    Returns:
+        AnalyzeResponse with analysis results
+    """
+    return run_analysis(request, db)
+
+
+def _no_progress(pct: int, stage: str) -> None:
+    """Default progress callback for synchronous analysis"""
+
+
+def run_analysis(
+    request: AnalyzeRequest,
+    db: Session,
+    report: Callable[[int, str], None] = _no_progress
+) -> AnalyzeResponse:
     """
     Analyze YouTube video comments with BERT sentiment analysis
     
@@ -224,21 +431,27 @@ def analyze_video(
     4. Run BERT sentiment analysis on each comment
     5. Store comments and sentiments in database
     6. Return analysis summary
+    
+    Args:
+        request: Video and user to analyze
+        db: Database session
+        report: Called with (percent, stage) as the analysis progresses
         
     Returns:
         AnalyzeResponse with analysis results
     """
     try:
+        report(5, "Validating request")
         logger.info(f"🎬 Starting analysis: video={request.youtube_video_id}, user={request.user_id}")
         
         # Validate user
         user = get_current_user(request.user_id, db)
-        logger.debug(f"✅ User validated: {user.email}")
+        logger.debug("✅ User validated: %s", user.email)
         
         # Extract clean video ID
         try:
             video_id = extract_video_id(request.youtube_video_id)
-            logger.debug(f"📹 Extracted video ID: {video_id}")
+            logger.debug("📹 Extracted video ID: %s", video_id)
         except Exception as e:
             logger.error(f"❌ Invalid video ID/URL: {request.youtube_video_id}")
             raise HTTPException(
@@ -254,38 +467,8 @@ def analyze_video(
                 detail="No YouTube access token found. Please login again."
             )
         
-        # Create or get video in database (with title)
-        # First, try to get the video title from YouTube
-        video_title = None
-        try:
-            import requests as req
-            title_response = req.get(
-                YOUTUBE_API_VIDEO_ENDPOINT,
-                params={
-                    "part": "snippet",
-                    "id": video_id,
-                    "fields": "items(snippet(title))"
-                },
-                headers={"Authorization": f"Bearer {user.access_token}"},
-                timeout=5
-            )
-            if title_response.status_code == 200:
-                title_data = title_response.json()
-                if title_data.get("items"):
-                    video_title = title_data["items"][0]["snippet"]["title"]
-                    logger.info(f"📺 Video title: {video_title}")
-        except Exception as e:
-            logger.warning(f"Could not fetch video title: {e}")
-        
-        video = crud.create_or_get_video(
-            db,
-            youtube_video_id=video_id,
-            user_id=user.user_id,
-            title=video_title
-        )
-        logger.info(f"📊 Video DB ID: {video.video_id}")
-        
-        # Check for recent cached analysis
+        # Check for recent cached analysis before any YouTube call or video write
+        report(10, "Checking for cached analysis")
         logger.info("🔍 Checking for cached analysis...")
         cached_analysis = crud.get_recent_analysis(db, video_id, hours=DEFAULT_CACHE_HOURS)
         
@@ -299,7 +482,7 @@ def analyze_video(
                 success=True,
                 message="Retrieved cached analysis!",
                 analysis_id=cached_analysis.analysis_id,
-                video_id=video.video_id,
+                video_id=cached_analysis.video_id,
                 total_comments=cached_analysis.total_comments,
                 positive_count=cached_analysis.positive_count,
                 negative_count=cached_analysis.negative_count,
@@ -311,11 +494,39 @@ def analyze_video(
         
         logger.info("📥 No cached analysis found, proceeding with fresh analysis...")
         
-        # Fetch comments from YouTube
+        # Fetch the video title in the background while comments download and analyze
+        title_future = get_title_executor().submit(fetch_video_titles, [video_id], user.access_token)
+        
+        raw_comments = []
+        batch_results = []
+
+        def analyze_pending(min_pending: int, total: Optional[int] = None) -> None:
+            # Analyze buffered comments in ANALYSIS_PROGRESS_CHUNK slices, reporting progress after each
+            while len(raw_comments) - len(batch_results) >= min_pending:
+                start = len(batch_results)
+                chunk = [comment["text"] for comment in raw_comments[start:start + ANALYSIS_PROGRESS_CHUNK]]
+                try:
+                    batch_results.extend(get_bert_analyzer().analyze_comments_batch(chunk, batch_size=32))
+                except Exception as e:
+                    logger.exception("❌ Sentiment analysis failed")
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Sentiment analysis failed: {str(e)}"
+                    )
+                done = len(batch_results)
+                if total:
+                    report(40 + 45 * done // total, f"Analyzing sentiment ({done}/{total})")
+                else: # total unknown while pages are still arriving, creep towards 85
+                    report(85 - 45 * ANALYSIS_PROGRESS_CHUNK // (done + ANALYSIS_PROGRESS_CHUNK), f"Analyzing sentiment ({done} comments)")
+
+        # Fetch comments from YouTube, analyzing full slices while later pages download
         try:
+            report(20, "Fetching comments from YouTube")
             logger.info("📥 Fetching comments from YouTube...")
             fetcher = YoutubeCommentFetcher(user.access_token, video_id)
-            raw_comments = fetcher.get_comments()
+            for page in iter_in_background(fetcher.iter_comment_pages(), COMMENT_PAGE_PREFETCH):
+                raw_comments.extend(page)
+                analyze_pending(ANALYSIS_PROGRESS_CHUNK)
             logger.info(f"✅ Fetched {len(raw_comments)} comments")
             
             if not raw_comments:
@@ -325,6 +536,8 @@ def analyze_video(
                     message="No comments found for this video. The video may have comments disabled or no comments yet."
                 )
                 
+        except HTTPException:
+            raise
         except APIQuotaExceededError:
             logger.error("❌ YouTube API quota exceeded")
             raise HTTPException(
@@ -356,55 +569,30 @@ def analyze_video(
                 detail=f"Failed to fetch comments: {str(e)}"
             )
         
-        # Run sentiment analysis with BERT
+        # Run sentiment analysis with BERT on the comments left after the last page
         try:
-            logger.info("🤖 Running BERT sentiment analysis...")
-            analyzer = get_bert_analyzer()
-            
-            sentiment_counts = {"POSITIVE": 0, "NEGATIVE": 0, "NEUTRAL": 0}
-            comments_data = []
-            negative_comments = []
-
-            # Batch
-            logger.info("Running batch analysis...")
-            comment_texts = [comment["text"] for comment in raw_comments]
-            batch_results = analyzer.analyze_comments_batch(comment_texts, batch_size=32)
+            analyze_pending(1, total=len(raw_comments))
+            logger.info("🤖 BERT sentiment analysis finished")
 
-            # Reset counters and lists
+            # Count labels in one C-level pass instead of a dict increment per comment
             sentiment_counts = {"POSITIVE": 0, "NEGATIVE": 0, "NEUTRAL": 0}
-            comments_data = []
-            negative_comments = []
+            sentiment_counts.update(Counter(result["label"] for result in batch_results))
 
-            # Process batch results
-            for i, (raw_comment, result) in enumerate(zip(raw_comments, batch_results)):
-                label = result["label"]
-                confidence = result["score"]
-
-                sentiment_counts[label] += 1
-
-                # Prepare comment data for DB
-                comment_data = {
+            # Prepare comment data for DB
+            comments_data = [
+                {
                     "author": raw_comment["author"],
                     "text": raw_comment["text"],
-                    "sentiment": label,
-                    "confidence": confidence
+                    "sentiment": result["label"],
+                    "confidence": result["score"]
                 }
-                comments_data.append(comment_data)
-
-                # Track negative comments
-                if label == "NEGATIVE":
-                    negative_comments.append({
-                        "author": raw_comment["author"],
-                        "text": raw_comment["text"],
-                        "confidence": confidence
-                    })
-
-                # Log progress every 50 comments
-                if (i + 1) % 50 == 0:
-                    logger.info(f"📊 Analyzed {i + 1}/{len(raw_comments)} comments", flush = True)
+                for raw_comment, result in zip(raw_comments, batch_results)
+            ]
 
             logger.info(f"✅ Analysis complete: {sentiment_counts}")
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.exception("❌ Sentiment analysis failed")
             raise HTTPException(
@@ -412,22 +600,47 @@ def analyze_video(
                 detail=f"Sentiment analysis failed: {str(e)}"
             )
         
+        # Create or get video in database (with the title fetched alongside the comments)
+        video_title = None
+        try:
+            video_title = title_future.result().get(video_id)
+            if video_title:
+                logger.info(f"📺 Video title: {video_title}")
+        except Exception as e:
+            logger.warning(f"Could not fetch video title: {e}")
+        
+        video = crud.create_or_get_video(
+            db,
+            youtube_video_id=video_id,
+            user_id=user.user_id,
+            title=video_title
+        )
+        logger.info(f"📊 Video DB ID: {video.video_id}")
+        
         # Store comments in database
         try:
+            report(85, "Storing results")
             logger.info("💾 Storing comments in database...")
-            stored_comments = crud.store_comments_bulk(
+            stored_count = crud.store_comments_bulk(
                 db,
                 video_id=video.video_id,
                 comments_data=comments_data
             )
-            logger.info(f"✅ Stored {len(stored_comments)} comments")
+            logger.info(f"✅ Stored {stored_count} comments")
         except Exception as e:
             logger.error(f"⚠️ Failed to store comments: {e}")
             logger.warning("⚠️ Continuing without storing comments")
         
-        # Get top negative comments, sorted by confidence
-        negative_comments.sort(key=lambda x: x["confidence"], reverse=True)
-        top_negative = negative_comments[:DEFAULT_TOP_NEGATIVE_LIMIT]
+        # Get top negative comments, sorted by confidence (selects the top few instead of sorting every negative)
+        negative_comments = (comment for comment in comments_data if comment["sentiment"] == "NEGATIVE")
+        top_negative = [
+            {
+                "author": comment["author"],
+                "text": comment["text"],
+                "confidence": comment["confidence"]
+            }
+            for comment in heapq.nlargest(DEFAULT_TOP_NEGATIVE_LIMIT, negative_comments, key=itemgetter("confidence"))
+        ]
         
         # Store analysis summary in database
         try:
@@ -477,6 +690,97 @@ def analyze_video(
         )
 
 
+# ANALYSIS JOB ENDPOINTS
+
+# In-memory job registry for this process; finished jobs are pruned after JOB_RETENTION_SECONDS
+_jobs: dict = {}
+_jobs_lock = threading.Lock()
+
+
+def _update_job(job_id: str, **fields) -> None:
+    """Update a job's fields, stamping the finish time once it is done"""
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job.update(fields)
+        if job["done"]:
+            job["finished_at"] = time.time()
+
+
+def _run_analysis_job(job_id: str, request: AnalyzeRequest) -> None:
+    """Run an analysis in the background, recording progress and outcome on the job"""
+    def report(pct: int, stage: str) -> None:
+        _update_job(job_id, pct=pct, stage=stage)
+    
+    try:
+        with get_db_session() as db:
+            result = run_analysis(request, db, report)
+            db.commit()
+        _update_job(job_id, done=True, pct=100, stage="Done", result=result)
+    except HTTPException as e:
+        _update_job(job_id, done=True, stage="Failed", error=str(e.detail), status_code=e.status_code)
+    except Exception as e:
+        logger.exception(f"❌ Analysis job {job_id} failed")
+        _update_job(job_id, done=True, stage="Failed", error=str(e), status_code=500)
+
+
+@app.post("/api/jobs", response_model=AnalyzeJobResponse, status_code=202)
+def start_analysis_job(
+    request: AnalyzeRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_session)
+):
+    """
+    Start analyzing a video in the background
+    
+    Poll GET /api/jobs/{job_id} for progress and the AnalyzeResponse.
+    
+    Returns:
+        AnalyzeJobResponse with the job ID
+    """
+    # Fail fast on unknown users instead of inside the job
+    get_current_user(request.user_id, db)
+    
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    
+    with _jobs_lock:
+        # Drop finished jobs nobody has polled for a while
+        for stale_id in [
+            jid for jid, job in _jobs.items()
+            if job["done"] and now - job["finished_at"] > JOB_RETENTION_SECONDS
+        ]:
+            del _jobs[stale_id]
+        
+        _jobs[job_id] = {
+            "job_id": job_id,
+            "done": False,
+            "pct": 0,
+            "stage": "Queued",
+            "result": None,
+            "error": None,
+            "status_code": None
+        }
+    
+    background_tasks.add_task(_run_analysis_job, job_id, request)
+    logger.info(f"🧵 Queued analysis job {job_id}: video={request.youtube_video_id}, user={request.user_id}")
+    return AnalyzeJobResponse(job_id=job_id)
+
+
+@app.get("/api/jobs/{job_id}", response_model=AnalyzeJobStatus)
+def get_analysis_job(job_id: str):
+    """
+    Get progress of an analysis job
+    
+    Raises:
+        HTTPException: If the job does not exist (or has been pruned)
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Analysis job not found")
+        return AnalyzeJobStatus(**{k: v for k, v in job.items() if k != "finished_at"})
+
+
 # VIDEO LIST ENDPOINT
 
 @app.get("/api/videos", response_model=List[VideoListItem])
@@ -495,21 +799,20 @@ def list_videos(
         # Validate user
         user = get_current_user(user_id, db)
         
-        # Get videos
-        videos = crud.get_videos_by_user(db, user.user_id, limit=limit or DEFAULT_VIDEO_LIMIT)
+        # Get videos with their analysis counts in a single query
+        videos = crud.get_videos_with_analysis_counts(db, user.user_id, limit=limit or DEFAULT_VIDEO_LIMIT)
         
-        # Build response with analysis counts
-        result = []
-        for video in videos:
-            analyses = crud.get_analyses_by_video(db, video.video_id)
-            
-            result.append(VideoListItem(
+        # Build response
+        result = [
+            VideoListItem(
                 video_id=video.video_id,
                 youtube_video_id=video.youtube_video_id,
                 title=video.title,
                 created_at=video.created_at.isoformat(),
-                analysis_count=len(analyses)
-            ))
+                analysis_count=analysis_count
+            )
+            for video, analysis_count in videos
+        ]
         
         logger.info(f"📹 Retrieved {len(result)} videos for user {user_id}")
         return result
@@ -524,6 +827,38 @@ def list_videos(
         )
 
 
+@app.get("/api/videos/titles", response_model=Dict[str, str])
+def get_video_titles(
+    user_id: int,
+    ids: str,
+    db: Session = Depends(get_session)
+):
+    """
+    Get titles for comma-separated YouTube video IDs
+    
+    Returns:
+        Dict of video ID to title (unknown IDs are left out)
+    """
+    user = get_current_user(user_id, db)
+    
+    if not user.access_token:
+        raise HTTPException(
+            status_code=401,
+            detail="No YouTube access token found. Please login again."
+        )
+    
+    video_ids = [vid for vid in ids.split(",") if vid]
+    
+    try:
+        return fetch_video_titles(video_ids, user.access_token)
+    except requests.RequestException as e:
+        logger.warning(f"Could not fetch video titles: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Failed to fetch video titles from YouTube. Please try again later."
+        )
+
+
 # TOP NEGATIVE COMMENTS ENDPOINT
 
 @app.get("/api/videos/{youtube_video_id}/comments/top-negative", response_model=List[TopNegativeComment])
@@ -586,46 +921,28 @@ def get_top_negative_comments(
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     """Handle 404 errors"""
-    return {
-        "error": "Not Found",
-        "detail": "The requested resource was not found",
-        "status_code": 404
-    }
+    return JSONResponse(
+        status_code=404,
+        content={
+            "error": "Not Found",
+            "detail": "The requested resource was not found",
+            "status_code": 404
+        }
+    )
 
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     """Handle 500 errors"""
     logger.exception("Internal server error")
-    return {
-        "error": "Internal Server Error",
-        "detail": "An unexpected error occurred. Please try again later.",
-        "status_code": 500
-    }
-
-
-# STARTUP/SHUTDOWN EVENT
-
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup"""
-    logger.info(" FastAPI application starting...")
-    logger.info(f" API docs available at /docs")
-    logger.info(f" Allowed CORS origins: {', '.join(FRONTEND_ORIGINS)}")
-    
-    # Pre-load BERT model
-    try:
-        get_bert_analyzer()
-        logger.info("✅ BERT model pre-loaded successfully")
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to pre-load BERT model: {e}")
-        logger.warning("⚠️ Model will load on first analysis request")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown"""
-    logger.info(" FastAPI application shutting down...")
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal Server Error",
+            "detail": "An unexpected error occurred. Please try again later.",
+            "status_code": 500
+        }
+    )
 
 
 # RUN APPLICATION
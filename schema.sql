@@ -45,6 +45,7 @@ CREATE TABLE IF NOT EXISTS analyses (
 
 CREATE INDEX i_analyses_video_id ON analyses(video_id);
 CREATE INDEX i_analyses_user_id ON analyses(user_id);
+CREATE INDEX i_analyses_video_created ON analyses(video_id, created_at);
 
 -- Comments table: stores raw YouTube comments
 CREATE TABLE IF NOT EXISTS comments (
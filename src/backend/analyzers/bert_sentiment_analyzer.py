@@ -1,72 +1,144 @@
+import unicodedata
+import torch
 from transformers import pipeline
 from src.backend.analyzers.Isentiment_analyzer import ISentimentAnalyzer
 from src.utils.logger import get_logger
 from src.utils.exceptions import ModelLoadError, AnalysisFailedError
+from src.config.constants import DEFAULT_SENTIMENT_MODEL, DEFAULT_BERT_DTYPE
 from typing import List, Dict
 
+
+def has_content(text: str) -> bool:
+    # True if the text has anything beyond whitespace, punctuation and control characters
+    # (letters, digits, emoji); "...", "?!" and blank comments skip the model
+    return bool(text) and any(unicodedata.category(ch)[0] not in "PZC" for ch in text)
+
 class BertSentimentAnalyzer(ISentimentAnalyzer):
     #bert sentiment analyzer
     _pipeline = None # Class-level attribute for the pipeline
     _logger = None # Class-level attribute for the logger
+    _model_name = None # Checkpoint the shared pipeline was loaded from
+
+    # Map raw model labels to sentiment labels (LABEL_n ids of twitter-roberta-base-sentiment,
+    # named labels of checkpoints such as twitter-roberta-base-sentiment-latest or DistilBERT SST-2)
+    LABEL_MAPPING = {
+        'LABEL_0': 'NEGATIVE',
+        'LABEL_1': 'NEUTRAL',
+        'LABEL_2': 'POSITIVE',
+        'NEGATIVE': 'NEGATIVE',
+        'NEUTRAL': 'NEUTRAL',
+        'POSITIVE': 'POSITIVE'
+    }
 
-    def __init__(self):
+    def __init__(self, model_name: str = DEFAULT_SENTIMENT_MODEL, dtype: str = DEFAULT_BERT_DTYPE):
         if BertSentimentAnalyzer._logger is None: # if logger has not been created
             BertSentimentAnalyzer._logger = get_logger() # get logger
 
         self.logger = BertSentimentAnalyzer._logger
 
-        if BertSentimentAnalyzer._pipeline is None: # check if pipeline exists, if created already, reuse instead of reloading
-            self.load_model()
+        if BertSentimentAnalyzer._pipeline is None or BertSentimentAnalyzer._model_name != model_name: # reuse the pipeline unless a different checkpoint is requested
+            self.load_model(model_name, dtype)
         else:
             self.logger.debug("Reusing existing BERT model pipeline")
 
         self.sentiment_analyzer = BertSentimentAnalyzer._pipeline # Instance level attribute pointing to shared class-level attribute
 
-    def load_model(self) -> None:
-        # Load the RoBERTa model pipeline
-        model_name = 'cardiffnlp/twitter-roberta-base-sentiment'
-
+    def load_model(self, model_name: str = DEFAULT_SENTIMENT_MODEL, dtype: str = DEFAULT_BERT_DTYPE) -> None:
+        # Load the sentiment model pipeline (RoBERTa by default) in the requested precision
         try:
             self.logger.info(f"Loading BERT model: {model_name}")
             self.logger.info("This may take a few seconds on first load...")
 
+            use_cuda = torch.cuda.is_available()
             BertSentimentAnalyzer._pipeline = pipeline(
                 'sentiment-analysis', 
-                model=model_name
+                model=model_name,
+                device=0 if use_cuda else -1
             )
+            # Inference only: freeze the weights so autograd never tracks them
+            BertSentimentAnalyzer._pipeline.model.eval().requires_grad_(False)
+
+            if dtype == "auto": # FP16 on GPU, full precision on CPU (INT8 is opt-in)
+                dtype = "float16" if use_cuda else "float32"
+
+            if dtype == "int8":
+                if use_cuda: # dynamic quantization only has CPU kernels
+                    raise ValueError("BERT dtype 'int8' is CPU-only, use float16 or bfloat16 on CUDA")
+                self.quantize_model()
+            elif dtype in ("float16", "bfloat16"): # half-precision weights halve memory traffic (tensor cores on GPU, AMX on recent CPUs)
+                BertSentimentAnalyzer._pipeline.model.to(getattr(torch, dtype))
+                if dtype == "bfloat16" and not self._pipeline_accepts_bfloat16():
+                    BertSentimentAnalyzer._pipeline.model.to(torch.float32)
+                    self.logger.warning("This transformers version can't postprocess bfloat16 logits, using float32")
+                else:
+                    self.logger.info(f"Running BERT model in {dtype}")
+            elif dtype != "float32":
+                self.logger.warning(f"Unsupported BERT dtype '{dtype}', using float32")
 
+            if use_cuda:
+                self.compile_model()
+
+            BertSentimentAnalyzer._model_name = model_name
             self.logger.info(f"Successfully loaded BERT model: {model_name}")
 
         except Exception as e:
             self.logger.exception(f"Failed to load BERT model: {model_name}")
             raise ModelLoadError(model_name, e) 
 
+    def _pipeline_accepts_bfloat16(self) -> bool:
+        # Older transformers (e.g. 4.35) call .numpy() on the raw logits, which torch refuses for bfloat16
+        try:
+            BertSentimentAnalyzer._pipeline("warmup", truncation=True, max_length=128)
+            return True
+        except TypeError:
+            return False
+
+    def quantize_model(self) -> None:
+        # Dynamic INT8 quantization of the Linear layers for faster CPU inference
+        try:
+            if 'fbgemm' in torch.backends.quantized.supported_engines:
+                torch.backends.quantized.engine = 'fbgemm'
+
+            model = BertSentimentAnalyzer._pipeline.model
+            BertSentimentAnalyzer._pipeline.model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.logger.info("Quantized BERT linear layers to INT8")
+
+        except Exception as e: # quantization is an optimization, keep the FP32 model if it fails
+            self.logger.warning(f"INT8 quantization skipped, using FP32 model: {e}")
+
+    def compile_model(self) -> None:
+        # Fuse kernels with torch.compile on GPU (not used with the INT8 CPU model, the two don't mix)
+        model = BertSentimentAnalyzer._pipeline.model
+        try:
+            BertSentimentAnalyzer._pipeline.model = torch.compile(model, dynamic=True)
+            BertSentimentAnalyzer._pipeline("warmup", truncation=True, max_length=128) # compile at load instead of on the first request
+            self.logger.info("Compiled BERT model with torch.compile")
+
+        except Exception as e: # compilation is an optimization, keep the eager model if it fails
+            BertSentimentAnalyzer._pipeline.model = model
+            self.logger.warning(f"torch.compile skipped, using eager model: {e}")
+
     def analyze(self, text: str) -> dict:
         #analyze comment and return result in a dict
-        if not text or not text.strip(): # if there is no text
+        if not has_content(text): # if there is no text to classify
             self.logger.warning("Attempted to analyze empty text")
             return {"label": "NEUTRAL", "score": 0.0}
         
         try:
-            self.logger.debug(f"Analyzing text: {text[:50]}...")
+            self.logger.debug("Analyzing text: %s...", text[:50])
             result = self.sentiment_analyzer(text, truncation=True, max_length=128)[0]
             
-            # Map RoBERTa labels to sentiment labels
-            label_mapping = {
-                'LABEL_0': 'NEGATIVE',
-                'LABEL_1': 'NEUTRAL',
-                'LABEL_2': 'POSITIVE'
-            }
-            
             raw_label = result['label'] # store raw label
-            mapped_label = label_mapping.get(raw_label, 'NEUTRAL') # map raw label, default label is neutral
+            mapped_label = self.LABEL_MAPPING.get(raw_label.upper(), 'NEUTRAL') # map raw label, default label is neutral
             
             mapped_result = { #dict containing mapped labels and confidence scores 
                 'label': mapped_label,
                 'score': result['score']
             }
             
-            self.logger.debug(f"Analysis result: {mapped_label} (confidence: {result['score']:.3f})")
+            self.logger.debug("Analysis result: %s (confidence: %.3f)", mapped_label, result['score'])
             return mapped_result
 
         except Exception as e:
@@ -91,15 +163,16 @@ class BertSentimentAnalyzer(ISentimentAnalyzer):
             
             self.logger.info(f"Starting batch analysis of {len(texts)} texts with batch_size={batch_size}")
             
-            # Filter out empty texts and keep track of original indices
-            valid_texts = []
-            valid_indices = []
-            
+            # Filter out empty and punctuation-only texts and keep track of original indices, grouping identical
+            # texts ("First!", emoji-only comments) so each runs through the model once
+            indices_by_text = {}
             for i, text in enumerate(texts):
-                if text and text.strip():
-                    valid_texts.append(text)
-                    valid_indices.append(i)
+                if has_content(text):
+                    indices_by_text.setdefault(text, []).append(i)
             
+            # Longest first so each batch pads to similar lengths instead of one long outlier
+            valid_texts = sorted(indices_by_text, key=len, reverse=True)
+
             # Initialize results with neutral for all texts
             results = []
             for j in range(len(texts)):
@@ -118,23 +191,17 @@ class BertSentimentAnalyzer(ISentimentAnalyzer):
                     max_length=128
                 )
                 
-                # Map RoBERTa labels to sentiment labels
-                label_mapping = {
-                    'LABEL_0': 'NEGATIVE',
-                    'LABEL_1': 'NEUTRAL',
-                    'LABEL_2': 'POSITIVE'
-                }
-                
                 # Map results back to original indices
-                for k, result in zip(valid_indices, batch_results):
+                for text, result in zip(valid_texts, batch_results):
                     raw_label = result['label']
-                    mapped_label = label_mapping.get(raw_label, 'NEUTRAL')
-                    results[k] = {
-                        'label': mapped_label,
-                        'score': result['score']
-                    }
+                    mapped_label = self.LABEL_MAPPING.get(raw_label.upper(), 'NEUTRAL')
+                    for k in indices_by_text[text]:
+                        results[k] = {
+                            'label': mapped_label,
+                            'score': result['score']
+                        }
                 
-                self.logger.info(f"Batch analysis complete: {len(valid_texts)} texts analyzed")
+                self.logger.info(f"Batch analysis complete: {len(valid_texts)} unique texts analyzed")
                 return results
                 
             except Exception as e:
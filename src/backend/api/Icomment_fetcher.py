@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 class ICommentFetcher(ABC):
     #interface for fetching comments
@@ -6,4 +7,9 @@ class ICommentFetcher(ABC):
     @abstractmethod
     def get_comments(self) -> list[dict[str,str]]:
         #fetch comments and returns comments in a list of dicts with author, text, video_id
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def iter_comment_pages(self) -> Iterator[list[dict[str,str]]]:
+        #fetch comments page by page, yielding each page as a list of dicts with author, text, video_id
+        pass
@@ -1,10 +1,11 @@
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
+from typing import Iterator
 from src.backend.api.Icomment_fetcher import ICommentFetcher
 from src.utils.exceptions import APIConnectionError, APIQuotaExceededError, CommentsDisabledError, VideoNotFoundError
 from src.utils.logger import get_logger
-from src.config.constants import YOUTUBE_API_MAX_RESULTS
+from src.config.constants import YOUTUBE_API_MAX_RESULTS, YOUTUBE_COMMENT_FIELDS
 
 class APIError(Exception):
     pass
@@ -33,9 +34,15 @@ class YoutubeCommentFetcher(ICommentFetcher):
         self.youtube = build("youtube", "v3", credentials=credentials)
 
     def get_comments(self) -> list[dict[str, str]]:
-        self.logger.debug(f"Starting comment fetch for video: {self.VIDEO_ID}")
+        comments = [comment for page in self.iter_comment_pages() for comment in page]
+
+        self.logger.info(f"Successfully fetched {len(comments)} comments")
+        return comments
+
+    def iter_comment_pages(self) -> Iterator[list[dict[str, str]]]:
+        # Yield comments one API page at a time so callers can start on them before pagination ends
+        self.logger.debug("Starting comment fetch for video: %s", self.VIDEO_ID)
 
-        comments = []
         next_page_token = None  # start with no page token
 
         try:
@@ -45,18 +52,21 @@ class YoutubeCommentFetcher(ICommentFetcher):
                     videoId=self.VIDEO_ID,
                     maxResults=YOUTUBE_API_MAX_RESULTS,
                     textFormat="plainText",
+                    fields=YOUTUBE_COMMENT_FIELDS,  # only the fields we read, smaller responses to download and parse
                     pageToken=next_page_token  # handle pagination
                 )
                 response = request.execute()
-                self.logger.debug(f"API request successful for video: {self.VIDEO_ID}, fetched {len(response.get('items', []))} comments")
+                self.logger.debug("API request successful for video: %s, fetched %d comments", self.VIDEO_ID, len(response.get('items', [])))
             
+                page = []
                 for item in response.get("items", []):
                     comment = item["snippet"]["topLevelComment"]["snippet"]
-                    comments.append({
+                    page.append({
                         "author": comment["authorDisplayName"],
                         "text": comment["textDisplay"],
                         "video_id": self.VIDEO_ID
                     })
+                yield page
 
                 # Check if there is another page
                 next_page_token = response.get("nextPageToken")
@@ -86,6 +96,3 @@ class YoutubeCommentFetcher(ICommentFetcher):
         except Exception as e:
             self.logger.exception(f"Unexpected error fetching comments: {e}")
             raise APIConnectionError(e)
-    
-        self.logger.info(f"Successfully fetched {len(comments)} comments")
-        return comments
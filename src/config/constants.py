@@ -21,6 +21,18 @@ DEFAULT_VIDEO_LIMIT = 10
 # Default limit for user's video history
 DEFAULT_USER_VIDEOS_LIMIT = 20
 
+# Sentiment model checkpoint (3-class: negative / neutral / positive)
+DEFAULT_SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment"
+
+# Sentiment model precision: auto (FP16 on GPU, FP32 on CPU), int8 (CPU only), float16, bfloat16 or float32
+DEFAULT_BERT_DTYPE = "auto"
+
+# Comments analyzed between progress updates of an analysis job
+ANALYSIS_PROGRESS_CHUNK = 256
+
+# YouTube comment pages fetched ahead of the analyzer during an analysis
+COMMENT_PAGE_PREFETCH = 4
+
 # ============================================================================
 # API CONFIGURATION
 # ============================================================================
@@ -31,9 +43,36 @@ API_TIMEOUT_SECONDS = 300  # 5 minutes
 # Timeout for general HTTP requests
 REQUEST_TIMEOUT_SECONDS = 10
 
+# How long Streamlit keeps read-only API responses cached between reruns
+API_CACHE_TTL_SECONDS = 300  # 5 minutes
+
+# How long a FastAPI health check result is reused before probing again
+API_HEALTH_CACHE_TTL_SECONDS = 5
+
+# How long the API reuses its last database ping for /health
+DB_HEALTH_CACHE_TTL_SECONDS = 5
+
+# How often Streamlit polls a running analysis job for progress
+JOB_POLL_INTERVAL_SECONDS = 1.5
+
+# How long a finished analysis job is kept for polling before it is pruned
+JOB_RETENTION_SECONDS = 3600  # 1 hour
+
 # YouTube API maximum results per request
 YOUTUBE_API_MAX_RESULTS = 100
 
+# Partial response mask for commentThreads.list (only the fields the fetcher reads)
+YOUTUBE_COMMENT_FIELDS = "nextPageToken,items/snippet/topLevelComment/snippet(authorDisplayName,textDisplay)"
+
+# YouTube videos.list maximum IDs per request
+YOUTUBE_VIDEOS_MAX_IDS = 50
+
+# How long the API reuses a fetched video title
+TITLE_CACHE_TTL_SECONDS = 3600  # 1 hour
+
+# Most video titles the API keeps cached in memory
+TITLE_CACHE_MAX_ENTRIES = 10000
+
 # ============================================================================
 # OAUTH & AUTHENTICATION
 # ============================================================================
@@ -41,6 +80,9 @@ YOUTUBE_API_MAX_RESULTS = 100
 # Default token expiry in seconds (1 hour)
 DEFAULT_TOKEN_EXPIRY_SECONDS = 3600
 
+# Refresh the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
 # Google OAuth scopes required for the application
 GOOGLE_OAUTH_SCOPES = [
     "https://www.googleapis.com/auth/userinfo.email",
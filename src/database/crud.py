@@ -1,8 +1,8 @@
 """CRUD operations for database (Synchronous)"""
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 import json
 
 from src.database.models import User, Video, Analysis, Comment
@@ -110,6 +110,19 @@ def get_videos_by_user(db: Session, user_id: int, limit: int = 10) -> List[Video
     return db.query(Video).filter_by(user_id=user_id).order_by(desc(Video.created_at)).limit(limit).all()
 
 
+def get_videos_with_analysis_counts(db: Session, user_id: int, limit: int = 10) -> List[Tuple[Video, int]]:
+    #Get videos analyzed by user with their analysis count in one grouped query (most recent first)
+    return (
+        db.query(Video, func.count(Analysis.analysis_id))
+        .outerjoin(Analysis, Analysis.video_id == Video.video_id)
+        .filter(Video.user_id == user_id)
+        .group_by(Video.video_id)
+        .order_by(desc(Video.created_at))
+        .limit(limit)
+        .all()
+    )
+
+
 # COMMENT CRUD
 
 def store_comment(
@@ -151,9 +164,9 @@ def store_comments_bulk(
     db: Session,
     video_id: int,
     comments_data: List[dict]
-) -> List[Comment]:
+) -> int:
     """
-    Store multiple comments at once
+    Store multiple comments at once with a single executemany INSERT
     
     Args:
         db: Database session
@@ -161,27 +174,26 @@ def store_comments_bulk(
         comments_data: List of dicts with keys: author, text, sentiment, confidence
         
     Returns:
-        List[Comment]: Created comments
+        int: Number of comments stored
     """
-    comments = []
-    for data in comments_data:
-        comment = Comment(
-            video_id=video_id,
-            author=data.get("author"),
-            text=data.get("text"),
-            sentiment=data.get("sentiment"),
-            confidence=data.get("confidence")
-        )
-        comments.append(comment)
+    if not comments_data:
+        return 0
     
-    db.add_all(comments)
+    # Core insert skips building and refreshing an ORM object per row; the driver batches the rows
+    rows = [
+        {
+            "video_id": video_id,
+            "author": data.get("author"),
+            "text": data.get("text"),
+            "sentiment": data.get("sentiment"),
+            "confidence": data.get("confidence")
+        }
+        for data in comments_data
+    ]
+    db.execute(Comment.__table__.insert(), rows)
     db.commit()
     
-    # Refresh all comments
-    for comment in comments:
-        db.refresh(comment)
-    
-    return comments
+    return len(rows)
 
 
 def get_negative_comments(db: Session, video_id: int, limit: int = 10) -> List[Comment]:
@@ -276,16 +288,13 @@ def get_recent_analysis(db: Session, youtube_video_id: str, hours: int = 24) ->
     Returns:
         Analysis if found within time window, None otherwise
     """
-    
-    video = get_video_by_youtube_id(db, youtube_video_id)
-    if not video:
-        return None
-    
     cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
     
+    # Join on the video instead of looking it up first, one round trip either way
     analysis = (
         db.query(Analysis)
-        .filter_by(video_id=video.video_id)
+        .join(Video, Analysis.video_id == Video.video_id)
+        .filter(Video.youtube_video_id == youtube_video_id)
         .filter(Analysis.created_at >= cutoff_time)
         .order_by(desc(Analysis.created_at))
         .first()
@@ -26,6 +26,7 @@ if DATABASE_URL.startswith("postgres://"):
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
+    pool_recycle=1800,  # Replace connections after 30 minutes, before the server drops idle ones
     pool_size=5,
     max_overflow=10,
     echo=False  # Set to True for SQL debugging
@@ -49,7 +50,12 @@ def get_session() -> Generator[Session, None, None]:
 
 
 def get_db_session() -> Session:
-    """Get a database session for manual use (Streamlit)"""
+    """
+    Get a pooled database session for manual use (Streamlit)
+    
+    Use it as a context manager (`with get_db_session() as db:`) so the
+    connection is returned to the pool even if an error is raised.
+    """
     return SessionLocal()
 
 
@@ -1,6 +1,6 @@
 """SQLAlchemy ORM Models (Synchronous) for Neon PostgreSQL """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, EmailStr
@@ -54,6 +54,9 @@ class Video(Base):
 class Analysis(Base):
     """Analysis model - stores sentiment analysis results"""
     __tablename__ = 'analyses'
+    __table_args__ = (
+        Index('i_analyses_video_created', 'video_id', 'created_at'),  # latest analysis per video in one index scan
+    )
     
     analysis_id = Column(Integer, primary_key=True, autoincrement=True)
     video_id = Column(Integer, ForeignKey('videos.video_id', ondelete='CASCADE'), nullable=False, index=True)
@@ -1,4 +1,5 @@
 from src.utils.logger import AppLogger, get_logger
+from src.utils.url import extract_video_id
 from src.utils.exceptions import (
     SentimentAnalyzerError,
     APIError,
@@ -37,29 +37,29 @@ class AppLogger:
             logging.basicConfig(level=logging.INFO)
             logging.error(f"Invalid JSON in logging config: {e}")
 
-    def debug(self, msg: str, **kwargs) -> None:
-        """Log debug message"""
-        self.logger.debug(msg, extra=kwargs)
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        """Log debug message (%-style args are only formatted if the record is emitted)"""
+        self.logger.debug(msg, *args, extra=kwargs)
 
-    def info(self, msg: str, **kwargs) -> None:
+    def info(self, msg: str, *args, **kwargs) -> None:
         """Log info message"""
-        self.logger.info(msg, extra=kwargs)
+        self.logger.info(msg, *args, extra=kwargs)
 
-    def warning(self, msg: str, **kwargs) -> None:
+    def warning(self, msg: str, *args, **kwargs) -> None:
         """Log warning message"""
-        self.logger.warning(msg, extra=kwargs)
+        self.logger.warning(msg, *args, extra=kwargs)
 
-    def error(self, msg: str, **kwargs) -> None:
+    def error(self, msg: str, *args, **kwargs) -> None:
         """Log error message"""
-        self.logger.error(msg, extra=kwargs)
+        self.logger.error(msg, *args, extra=kwargs)
 
-    def critical(self, msg: str, **kwargs) -> None:
+    def critical(self, msg: str, *args, **kwargs) -> None:
         """Log critical message"""
-        self.logger.critical(msg, extra=kwargs)
+        self.logger.critical(msg, *args, extra=kwargs)
 
-    def exception(self, msg: str, **kwargs) -> None:
+    def exception(self, msg: str, *args, **kwargs) -> None:
         """Log exception with traceback"""
-        self.logger.exception(msg, extra=kwargs)
+        self.logger.exception(msg, *args, extra=kwargs)
 
 
 def get_logger() -> AppLogger:
@@ -0,0 +1,29 @@
+import re
+from functools import lru_cache
+
+# YouTube video ID patterns (compiled once, shared by the API and the Streamlit app)
+_VIDEO_ID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+_YOUTUBE_URL_RE = re.compile(
+    r"(?:youtu\.be/|youtube\.com/(?:watch\?(?:.*&)?v=|embed/|v/|shorts/))([A-Za-z0-9_-]{11})"
+)
+
+
+@lru_cache(maxsize=256)
+def extract_video_id(youtube_url_or_id: str) -> str:
+    """
+    Extract video ID from YouTube URL or return ID if already extracted
+
+    Supports:
+    - https://www.youtube.com/watch?v=VIDEO_ID
+    - https://youtu.be/VIDEO_ID
+    - https://www.youtube.com/embed/VIDEO_ID, /v/VIDEO_ID, /shorts/VIDEO_ID
+    - VIDEO_ID (direct)
+    """
+    # If it's already an ID (11 chars), return it
+    if len(youtube_url_or_id) == 11 and _VIDEO_ID_RE.fullmatch(youtube_url_or_id):
+        return youtube_url_or_id
+
+    match = _YOUTUBE_URL_RE.search(youtube_url_or_id)
+
+    # Assume it's already a video ID if it can't be parsed
+    return match.group(1) if match else youtube_url_or_id
@@ -1,40 +1,129 @@
 import pytest
-from unittest.mock import Mock, patch
+import torch
+from unittest.mock import Mock
+from src.utils.exceptions import ModelLoadError
+from src.backend.analyzers import bert_sentiment_analyzer
 from src.backend.analyzers.bert_sentiment_analyzer import BertSentimentAnalyzer
 
-@patch('src.backend.analyzers.bert_sentiment_analyzer.pipeline')
-@patch('src.backend.analyzers.bert_sentiment_analyzer.get_logger')
-def test_analyzer_returns_dict_with_label_and_score(mock_logger, mock_pipeline):
-    """Test that analyzer returns dict with 'label' and 'score' keys"""
-    
+
+@pytest.fixture
+def patched_analyzer(monkeypatch):
+    """Analyzer with the pipeline and logger patched out, plus the mocked pipeline"""
+
     # Reset singleton
     BertSentimentAnalyzer._pipeline = None
     BertSentimentAnalyzer._logger = None
-    
-    # Mock the pipeline
-    mock_pipe = Mock()
-    mock_pipe.return_value = [{"label": "LABEL_2", "score": 0.95}]
-    mock_pipeline.return_value = mock_pipe
-    
-    analyzer = BertSentimentAnalyzer()
+
+    # Fresh mock per test so call history and child mocks (.model.to) never leak between tests
+    mock_pipe = Mock(return_value=[{"label": "LABEL_2", "score": 0.95}])
+    monkeypatch.setattr(bert_sentiment_analyzer, "pipeline", lambda *args, **kwargs: mock_pipe)
+    monkeypatch.setattr(bert_sentiment_analyzer, "get_logger", lambda *args, **kwargs: Mock())
+
+    return BertSentimentAnalyzer(), mock_pipe
+
+
+def test_analyzer_returns_dict_with_label_and_score(patched_analyzer):
+    """Test that analyzer returns dict with 'label' and 'score' keys"""
+
+    analyzer, mock_pipe = patched_analyzer
+
     result = analyzer.analyze("This is great!")
-    
+
     assert "label" in result
     assert "score" in result
 
 
-@patch('src.backend.analyzers.bert_sentiment_analyzer.pipeline')
-@patch('src.backend.analyzers.bert_sentiment_analyzer.get_logger')
-def test_analyzer_handles_empty_text(mock_logger, mock_pipeline):
+def test_analyzer_handles_empty_text(patched_analyzer):
     """Test that analyzer handles empty text gracefully"""
 
-    BertSentimentAnalyzer._pipeline = None
-    BertSentimentAnalyzer._logger = None
-    
-    mock_pipeline.return_value = Mock()
-    
-    analyzer = BertSentimentAnalyzer()
+    analyzer, mock_pipe = patched_analyzer
+
     result = analyzer.analyze("")
-    
+
     assert result["label"] == "NEUTRAL"
     assert result["score"] == 0.0
+
+
+def test_batch_analysis_sorts_by_length_and_keeps_input_order(patched_analyzer):
+    """Test that batch analysis feeds the longest texts first but returns results in input order"""
+
+    analyzer, mock_pipe = patched_analyzer
+    labels = {"ok": "LABEL_1", "really bad video": "LABEL_0", "great!": "LABEL_2"}
+    mock_pipe.side_effect = lambda texts, **kwargs: [{"label": labels[t], "score": 0.9} for t in texts]
+
+    results = analyzer.analyze_comments_batch(["ok", "", "really bad video", "great!"])
+
+    assert mock_pipe.call_args.args[0] == ["really bad video", "great!", "ok"]
+    assert [r["label"] for r in results] == ["NEUTRAL", "NEUTRAL", "NEGATIVE", "POSITIVE"]
+    assert results[1]["score"] == 0.0
+
+
+def test_analyzer_maps_named_labels_from_other_checkpoints(patched_analyzer):
+    """Test that named labels (e.g. 'negative' from -latest checkpoints) map to sentiment labels"""
+
+    analyzer, mock_pipe = patched_analyzer
+    mock_pipe.return_value = [{"label": "negative", "score": 0.8}]
+
+    result = analyzer.analyze("This is awful")
+
+    assert result["label"] == "NEGATIVE"
+
+
+def test_batch_analysis_runs_duplicate_texts_once(patched_analyzer):
+    """Test that identical texts are analyzed once and the result is shared by every copy"""
+
+    analyzer, mock_pipe = patched_analyzer
+    mock_pipe.side_effect = lambda texts, **kwargs: [{"label": "LABEL_2", "score": 0.9} for _ in texts]
+
+    results = analyzer.analyze_comments_batch(["First!", "nice", "First!", "First!"])
+
+    assert mock_pipe.call_args.args[0] == ["First!", "nice"]
+    assert [r["label"] for r in results] == ["POSITIVE"] * 4
+
+
+def test_analyzer_casts_model_to_requested_half_precision(patched_analyzer):
+    """Test that a bfloat16 dtype casts the model weights instead of quantizing them"""
+
+    _, mock_pipe = patched_analyzer
+    mock_pipe.model.reset_mock()
+
+    BertSentimentAnalyzer._pipeline = None
+    BertSentimentAnalyzer(dtype="bfloat16")
+
+    mock_pipe.model.to.assert_called_once_with(torch.bfloat16)
+
+
+def test_analyzer_falls_back_to_float32_when_pipeline_rejects_bfloat16(patched_analyzer):
+    """Test that bfloat16 reverts to float32 when the pipeline can't postprocess bfloat16 logits"""
+
+    _, mock_pipe = patched_analyzer
+    mock_pipe.model.reset_mock()
+    mock_pipe.side_effect = TypeError("Got unsupported ScalarType BFloat16")
+
+    BertSentimentAnalyzer._pipeline = None
+    BertSentimentAnalyzer(dtype="bfloat16")
+
+    assert mock_pipe.model.to.call_args.args == (torch.float32,)
+
+
+def test_analyzer_rejects_int8_on_cuda(patched_analyzer, monkeypatch):
+    """Test that int8 is refused on CUDA, where dynamic quantization has no kernels"""
+
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: True)
+
+    BertSentimentAnalyzer._pipeline = None
+    with pytest.raises(ModelLoadError):
+        BertSentimentAnalyzer(dtype="int8")
+
+
+def test_batch_analysis_skips_model_for_punctuation_only_texts(patched_analyzer):
+    """Test that punctuation-only comments are neutral without a model pass while emoji still reach the model"""
+
+    analyzer, mock_pipe = patched_analyzer
+    mock_pipe.side_effect = lambda texts, **kwargs: [{"label": "LABEL_2", "score": 0.9} for _ in texts]
+
+    results = analyzer.analyze_comments_batch(["...", "🔥🔥", " ?! "])
+
+    assert mock_pipe.call_args.args[0] == ["🔥🔥"]
+    assert results[0] == {"label": "NEUTRAL", "score": 0.0}
+    assert results[1]["label"] == "POSITIVE"
@@ -22,11 +22,26 @@ def test_create_or_update_user_creates_new_user():
 
 def test_extract_video_id_from_url_handles_query_params():
     """Test video ID extraction ignores query parameters"""
-    from main import extract_video_id
-    
     url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&feature=share"
     
     video_id = extract_video_id(url)
     
     assert video_id == "dQw4w9WgXcQ"
-    assert "feature" not in video_id
\ No newline at end of file
+    assert "feature" not in video_id
+
+def test_store_comments_bulk_inserts_all_rows_in_one_execute():
+    """Test that store_comments_bulk sends every comment in a single executemany and returns the count"""
+    
+    mock_db = MagicMock()
+    comments_data = [
+        {"author": "a", "text": "great", "sentiment": "POSITIVE", "confidence": 0.9},
+        {"author": "b", "text": "bad", "sentiment": "NEGATIVE", "confidence": 0.8}
+    ]
+    
+    stored = crud.store_comments_bulk(mock_db, video_id=7, comments_data=comments_data)
+    
+    assert stored == 2
+    mock_db.execute.assert_called_once()
+    rows = mock_db.execute.call_args.args[1]
+    assert [row["video_id"] for row in rows] == [7, 7]
+    mock_db.refresh.assert_not_called()
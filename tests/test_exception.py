@@ -1,17 +1,17 @@
+import pytest
 from src.utils.exceptions import APIQuotaExceededError
+from src.utils.exceptions import AnalysisFailedError
 from src.utils.exceptions import CommentNotFoundError
 
-def test_comment_not_found_error_includes_id():
-    """Test that CommentNotFoundError includes comment ID in details"""
-    
-    error = CommentNotFoundError(comment_id=123)
-    
-    assert "123" in str(error) or 123 in error.details.values()
 
+@pytest.mark.parametrize("error_cls, args, needle", [
+    (CommentNotFoundError, (123,), "123"),
+    (AnalysisFailedError, (1, Exception("boom")), "failed"),
+    (APIQuotaExceededError, (), "quota"),
+])
+def test_custom_exception_message_is_descriptive(error_cls, args, needle):
+    """Test that custom exceptions include a descriptive message and details"""
 
-def test_api_quota_exceeded_error_has_message():
-    """Test that APIQuotaExceededError has descriptive message"""
-    
-    error = APIQuotaExceededError()
-    
-    assert "quota" in str(error).lower()
\ No newline at end of file
+    error = error_cls(*args)
+
+    assert needle in str(error).lower()
@@ -4,6 +4,13 @@ from src.database import crud
 from fastapi.testclient import TestClient
 from main import app
 
+
+@pytest.fixture(scope="session")
+def client():
+    """Single TestClient shared by every endpoint test"""
+    return TestClient(app)
+
+
 def test_create_user_and_video_relationship():
     """Test creating user and associating video"""
     
@@ -69,11 +76,9 @@ def test_store_analysis_with_sentiment_counts():
 
 @patch('main.get_bert_analyzer')
 @patch('main.crud')
-def test_analyze_endpoint_returns_results(mock_crud, mock_analyzer):
+def test_analyze_endpoint_returns_results(mock_crud, mock_analyzer, client):
     """Test /api/analyze endpoint returns analysis results"""
     
-    client = TestClient(app)
-    
     # Mock user exists
     mock_user = Mock()
     mock_user.user_id = 1
@@ -102,14 +107,193 @@ def test_analyze_endpoint_returns_results(mock_crud, mock_analyzer):
     # validate the request format
     assert response.status_code in [200, 401, 422, 500, 503]
 
-def test_health_endpoint_responds():
+def test_health_endpoint_responds(client):
     """Test /health endpoint is accessible"""
-    from fastapi.testclient import TestClient
-    from main import app
-    
-    client = TestClient(app)
     
     response = client.get("/health")
     
     assert response.status_code == 200
     assert "status" in response.json()
+
+@patch('main.engine')
+def test_health_endpoint_reuses_recent_database_ping(mock_engine, client, monkeypatch):
+    """Test /health pings the database once and reuses the result within the cache window"""
+    
+    monkeypatch.setattr("main._db_health", (float("-inf"), None))
+    
+    first = client.get("/health").json()
+    second = client.get("/health").json()
+    
+    assert first["status"] == second["status"] == "healthy"
+    mock_engine.connect.assert_called_once()
+
+@patch('main.run_analysis')
+@patch('main.get_current_user')
+def test_analysis_job_reports_result(mock_get_user, mock_run_analysis, client):
+    """Test a started /api/jobs analysis can be polled to its result"""
+    
+    from main import AnalyzeResponse
+    mock_run_analysis.return_value = AnalyzeResponse(success=True, message="done", total_comments=3)
+    
+    # TestClient runs background tasks before returning the response
+    response = client.post("/api/jobs", json={"youtube_video_id": "test123", "user_id": 1})
+    assert response.status_code == 202
+    
+    status = client.get(f"/api/jobs/{response.json()['job_id']}").json()
+    
+    assert status["done"] is True
+    assert status["pct"] == 100
+    assert status["result"]["total_comments"] == 3
+
+def test_unknown_analysis_job_returns_404(client):
+    """Test polling a job that does not exist returns 404"""
+    
+    response = client.get("/api/jobs/does-not-exist")
+    
+    assert response.status_code == 404
+
+@patch('main._youtube_http')
+@patch('main.YoutubeCommentFetcher')
+@patch('main.get_bert_analyzer')
+@patch('main.crud')
+def test_run_analysis_reports_progress_while_analyzing(mock_crud, mock_analyzer, mock_fetcher, mock_http):
+    """Test run_analysis analyzes full slices as comment pages arrive and reports progress for each"""
+    
+    from main import AnalyzeRequest, run_analysis, ANALYSIS_PROGRESS_CHUNK
+    
+    mock_crud.get_recent_analysis.return_value = None
+    total = ANALYSIS_PROGRESS_CHUNK + 10
+    comments = [{"author": "a", "text": f"comment {i}"} for i in range(total)]
+    mock_fetcher.return_value.iter_comment_pages.return_value = iter([comments[:100], comments[100:200], comments[200:]])
+    mock_analyzer.return_value.analyze_comments_batch.side_effect = (
+        lambda texts, batch_size: [{"label": "POSITIVE", "score": 0.9} for _ in texts]
+    )
+    
+    progress = []
+    run_analysis(AnalyzeRequest(youtube_video_id="dQw4w9WgXcQ", user_id=1), Mock(), lambda pct, stage: progress.append(stage))
+    
+    assert f"Analyzing sentiment ({ANALYSIS_PROGRESS_CHUNK} comments)" in progress
+    assert f"Analyzing sentiment ({total}/{total})" in progress
+
+@patch('main._youtube_http')
+@patch('main.YoutubeCommentFetcher')
+@patch('main.get_bert_analyzer')
+@patch('main.crud')
+def test_run_analysis_stores_counts_and_most_confident_negatives(mock_crud, mock_analyzer, mock_fetcher, mock_http):
+    """Test run_analysis stores label counts and the top negatives ordered by confidence"""
+    
+    from main import AnalyzeRequest, run_analysis, DEFAULT_TOP_NEGATIVE_LIMIT
+    
+    mock_crud.get_recent_analysis.return_value = None
+    results = [("NEGATIVE", 0.5), ("POSITIVE", 0.9), ("NEGATIVE", 0.99), ("NEUTRAL", 0.7)] + [("NEGATIVE", 0.6)] * 5
+    mock_fetcher.return_value.iter_comment_pages.return_value = iter([
+        [{"author": f"a{i}", "text": f"comment {i}"} for i in range(len(results))]
+    ])
+    mock_analyzer.return_value.analyze_comments_batch.side_effect = (
+        lambda texts, batch_size: [{"label": label, "score": score} for label, score in results[:len(texts)]]
+    )
+    
+    run_analysis(AnalyzeRequest(youtube_video_id="dQw4w9WgXcQ", user_id=1), Mock())
+    
+    stored = mock_crud.store_analysis.call_args.kwargs
+    assert (stored["positive_count"], stored["neutral_count"], stored["negative_count"]) == (1, 1, 7)
+    assert len(stored["top_negative_comments"]) == DEFAULT_TOP_NEGATIVE_LIMIT
+    assert stored["top_negative_comments"][0] == {"author": "a2", "text": "comment 2", "confidence": 0.99}
+    assert stored["top_negative_comments"][-1]["confidence"] == 0.6
+
+@patch('main._youtube_http')
+@patch('main.YoutubeCommentFetcher')
+@patch('main.crud')
+def test_run_analysis_maps_errors_from_background_fetch(mock_crud, mock_fetcher, mock_http):
+    """Test a YouTube error raised on the page-fetching thread still maps to its HTTP status"""
+    
+    from fastapi import HTTPException
+    from main import AnalyzeRequest, run_analysis
+    from src.utils.exceptions import APIQuotaExceededError
+    
+    def pages():
+        yield [{"author": "a", "text": "first page"}]
+        raise APIQuotaExceededError()
+    
+    mock_crud.get_recent_analysis.return_value = None
+    mock_fetcher.return_value.iter_comment_pages.return_value = pages()
+    
+    with pytest.raises(HTTPException) as exc_info:
+        run_analysis(AnalyzeRequest(youtube_video_id="dQw4w9WgXcQ", user_id=1), Mock())
+    
+    assert exc_info.value.status_code == 429
+
+@patch('main.fetch_video_titles')
+@patch('main.crud')
+def test_run_analysis_returns_cached_analysis_without_youtube_calls(mock_crud, mock_titles):
+    """Test a recent cached analysis is returned before any title fetch or video write"""
+    
+    from main import AnalyzeRequest, run_analysis
+    
+    cached = Mock(analysis_id=7, video_id=3, total_comments=10, positive_count=5, negative_count=3, neutral_count=2,
+                  positive_percentage=50, negative_percentage=30, neutral_percentage=20)
+    mock_crud.get_recent_analysis.return_value = cached
+    
+    response = run_analysis(AnalyzeRequest(youtube_video_id="dQw4w9WgXcQ", user_id=1), Mock())
+    
+    assert response.analysis_id == 7
+    assert response.video_id == 3
+    mock_titles.assert_not_called()
+    mock_crud.create_or_get_video.assert_not_called()
+
+@patch('main._youtube_http.get')
+@patch('main.get_current_user')
+def test_video_titles_endpoint_batches_and_caches(mock_get_user, mock_get, client):
+    """Test /api/videos/titles fetches unknown titles once and serves repeats from cache"""
+    
+    mock_get_user.return_value = Mock(access_token="fake_token")
+    mock_get.return_value.json.return_value = {
+        "items": [{"id": "titleVid001", "snippet": {"title": "First"}}]
+    }
+    
+    for _ in range(2):
+        response = client.get("/api/videos/titles", params={"user_id": 1, "ids": "titleVid001,titleVid002"})
+        assert response.json() == {"titleVid001": "First"}
+    
+    # IDs YouTube didn't return are cached as misses too, so the repeat makes no request
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"]["id"] == "titleVid001,titleVid002"
+
+@patch('main._youtube_http.get')
+def test_title_cache_evicts_oldest_entries_past_its_limit(mock_get, monkeypatch):
+    """Test the in-memory title cache stays bounded by dropping the oldest fetched titles"""
+    
+    import main
+    
+    monkeypatch.setattr("main._title_cache", {})
+    monkeypatch.setattr("main.TITLE_CACHE_MAX_ENTRIES", 2)
+    for vid in ("evictVid001", "evictVid002", "evictVid003"):
+        mock_get.return_value.json.return_value = {"items": [{"id": vid, "snippet": {"title": vid}}]}
+        main.fetch_video_titles([vid], "fake_token")
+    
+    assert list(main._title_cache) == ["evictVid002", "evictVid003"]
+
+@patch('main.crud')
+def test_list_videos_uses_grouped_analysis_counts(mock_crud, client):
+    """Test /api/videos reads analysis counts from the grouped query instead of per-video lookups"""
+    
+    from datetime import datetime
+    
+    mock_crud.get_user_by_id.return_value = Mock(user_id=1)
+    video = Mock(video_id=4, youtube_video_id="dQw4w9WgXcQ", title="Rick", created_at=datetime(2025, 1, 1))
+    mock_crud.get_videos_with_analysis_counts.return_value = [(video, 3)]
+    
+    response = client.get("/api/videos", params={"user_id": 1})
+    
+    assert response.json()[0]["analysis_count"] == 3
+    mock_crud.get_analyses_by_video.assert_not_called()
+
+def test_title_executor_is_recreated_after_shutdown():
+    """Test a lifespan teardown doesn't leave later analyses with a dead title pool"""
+    
+    import main
+    
+    main.get_title_executor()
+    main.shutdown_title_executor()
+    
+    assert main.get_title_executor().submit(lambda: "ok").result() == "ok"